@@ -0,0 +1,182 @@
+"""
+Analytics Core for Airline Data Analytics Dashboard
+Vectorized aggregations over the columnar flight table
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from flight_table import LOCAL_HOUR_COLUMN, FlightPayload, as_table, build_flight_table
+
+TOP_N = 10
+
+# Statuses counted as operating on time
+ON_TIME_STATUSES = ['scheduled', 'active', 'landed']
+
+
+def top_counts(counts, n=TOP_N):
+    """Convert the first n entries of a sorted count Series to a JSON-ready dict"""
+    head = counts.iloc[:n]
+    return dict(zip(head.index.tolist(), head.tolist()))
+
+
+def contributions(table):
+    """The columns that decide how each flight counts towards the tallies"""
+    frame = table[['route', 'airline_name', 'dep_iata', 'arr_iata', 'flight_status', 'aircraft_iata']].copy()
+    frame['hour'] = table['dep_scheduled'].dt.hour.astype('Int64')
+    frame['local_hour'] = table[LOCAL_HOUR_COLUMN].astype('Int64')
+    return frame
+
+
+def _codes(series):
+    """Integer codes (-1 for missing) and the values they stand for"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+
+def _weighted_counts(columns, weights=None):
+    """
+    Count, or sum of weights, per observed value or value tuple of one or more columns as a dict
+
+    Rows with a missing value in any column are skipped. Counting is a
+    bincount over combined dictionary codes, so it costs one pass over the rows.
+    Keys come in order of first appearance, which is how value_counts breaks ties.
+    """
+    codes, sizes, uniques = None, [], []
+    for series in columns:
+        column_codes, column_uniques = _codes(series)
+        codes = column_codes.astype(np.int64) if codes is None else codes * len(column_uniques) + column_codes
+        codes[column_codes < 0] = -1
+        sizes.append(len(column_uniques))
+        uniques.append(column_uniques)
+
+    valid = codes >= 0
+    appearance, seen = pd.factorize(codes[valid])
+    counts = np.bincount(appearance, weights=None if weights is None else weights[valid], minlength=len(seen))
+    present = np.flatnonzero(counts)
+    observed = seen[present]
+    values = counts[present].round().astype(np.int64).tolist()
+    if len(columns) == 1:
+        return dict(zip(uniques[0].take(observed).tolist(), values))
+    positions = np.unravel_index(observed, sizes)
+    keys = zip(*(column_uniques.take(position).tolist() for column_uniques, position in zip(uniques, positions)))
+    return dict(zip(keys, values))
+
+
+def _interleaved(first, second):
+    """Two categorical columns as one, each row's value from first followed by its value from second"""
+    combined = union_categoricals([pd.Categorical(first), pd.Categorical(second)])
+    codes = combined.codes.reshape(2, -1).T.ravel()
+    return pd.Series(pd.Categorical.from_codes(codes, categories=combined.categories))
+
+
+def tally(frame):
+    """Every base count for a contributions frame, keyed by tally name"""
+    on_time = frame['flight_status'].isin(ON_TIME_STATUSES).to_numpy().astype(np.int64)
+    return {
+        'routes': _weighted_counts([frame['route']]),
+        'airlines': _weighted_counts([frame['airline_name']]),
+        'hours': _weighted_counts([frame['hour']]),
+        'local_hours': _weighted_counts([frame['local_hour']]),
+        # Departure then arrival airport of each flight, so ties rank by first mention
+        'airports': _weighted_counts([_interleaved(frame['dep_iata'], frame['arr_iata'])]),
+        'statuses': _weighted_counts([frame['flight_status']]),
+        'route_on_time': _weighted_counts([frame['route']], on_time),
+        'airline_on_time': _weighted_counts([frame['airline_name']], on_time),
+        'route_airlines': _weighted_counts([frame['route'], frame['airline_name']]),
+        'airline_aircraft': _weighted_counts([frame['airline_name'], frame['aircraft_iata']])
+    }
+
+
+def ranked(counts):
+    """A dict of counts as an int64 Series, busiest first"""
+    series = pd.Series(list(counts.values()), index=pd.Index(list(counts.keys()), tupleize_cols=False),
+                       dtype=np.int64)
+    return series.sort_values(ascending=False, kind='stable')
+
+
+class FlightAggregates:
+    """Route, airline, UTC and local hour, airport, status and on-time tallies for one dataset"""
+
+    def __init__(self, table):
+        tallies = tally(contributions(table))
+        self.total_flights = len(table)
+        self.tallies = tallies
+        self.routes = ranked(tallies['routes'])
+        self.airlines = ranked(tallies['airlines'])
+        self.hours = ranked(tallies['hours'])
+        self.local_hours = ranked(tallies['local_hours'])
+        self.statuses = ranked(tallies['statuses'])
+        self.airports = ranked(tallies['airports'])
+
+    def distinct(self, pairs, position):
+        """
+        Number of distinct partners per key of a pair tally
+
+        Args:
+            pairs: Name of a pair tally, e.g. 'route_airlines'
+            position: 0 to count per first element of each pair, 1 per second element
+        """
+        counts = {}
+        for pair in self.tallies[pairs]:
+            counts[pair[position]] = counts.get(pair[position], 0) + 1
+        return counts
+
+    def to_insights(self, top_n=TOP_N):
+        """Build the insights dict served by /api/data and /api/insights"""
+        return {
+            'total_flights': self.total_flights,
+            'popular_routes': top_counts(self.routes, top_n),
+            'airline_distribution': top_counts(self.airlines, top_n),
+            'peak_times': top_counts(self.hours, top_n),
+            'peak_times_local': top_counts(self.local_hours, top_n),
+            'airport_activity': top_counts(self.airports, top_n)
+        }
+
+    def to_summary(self, top_n=TOP_N):
+        """Headline figures and chart-ready series for the dashboard's summary view"""
+        routes = self.routes.iloc[:top_n]
+        airlines = self.airlines.iloc[:top_n]
+        airports = self.airports.iloc[:top_n]
+        # The peak times line plots every hour in clock order, not just the busiest
+        hours = self.hours.sort_index()
+        return {
+            'stats': {
+                'total_flights': self.total_flights,
+                'routes': len(self.routes),
+                'airlines': len(self.airlines),
+                'airports': len(self.airports)
+            },
+            'highlights': {
+                'top_route': routes.index[0] if len(routes) else None,
+                'leading_airline': airlines.index[0] if len(airlines) else None,
+                'peak_hour': int(self.hours.index[0]) if len(self.hours) else None
+            },
+            'charts': {
+                'popular_routes': {'x': routes.index.tolist(), 'y': routes.tolist()},
+                'airline_distribution': {'labels': airlines.index.tolist(), 'values': airlines.tolist()},
+                'peak_times': {'x': hours.index.tolist(), 'y': hours.tolist()},
+                'airport_activity': {'x': airports.index.tolist(), 'y': airports.tolist()}
+            }
+        }
+
+
+def aggregate_table(table):
+    """Compute every base tally as group-bys on the flight table"""
+    return FlightAggregates(table)
+
+
+def aggregate_data(data):
+    """Aggregates for a payload, computed at most once per ingested payload"""
+    if not isinstance(data, FlightPayload):
+        return aggregate_table(as_table(data))
+    if data.aggregates is None:
+        data.aggregates = aggregate_table(data.table)
+    return data.aggregates
+
+
+def aggregate_flights(flights):
+    """Flatten raw flight records and aggregate them"""
+    return aggregate_table(build_flight_table(flights))
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Airline Data Analytics Dashboard
+Times and peak memory of the generation, analytics and endpoint hot paths
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Benchmarks must not write the shared snapshot, history or metrics of a running server
+os.environ['SHARED_SNAPSHOT_DIR'] = ''
+os.environ['HISTORY_DIR'] = ''
+os.environ['METRICS_DIR'] = ''
+
+DEFAULT_SIZES = [300, 10000, 100000, 1000000]
+DEFAULT_SEED = 42
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10  # fractional slowdown or memory growth reported as a regression
+
+# Absolute changes below these are timer or allocator noise, never regressions
+NOISE_FLOOR = {'seconds_min': 0.002, 'peak_bytes': 256 * 1024}
+
+# Path -> query string; /api/data asks for a full upstream page so its size is explicit
+ENDPOINTS = {
+    '/api/data': 'limit={limit}&page_size={limit}',
+    '/api/insights': '',
+    '/api/charts': ''
+}
+
+# Fresh interpreter timed from before `import app` to its first response; prints seconds and peak RSS
+STARTUP_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+import app
+if sys.argv[1] != 'import':
+    app.app.test_client().get(sys.argv[1])
+seconds = time.perf_counter() - started
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+except ImportError:
+    peak = 0
+print(json.dumps({'seconds': seconds, 'peak_bytes': peak}))
+'''
+
+STARTUP_CASES = {
+    'startup: import app': 'import',
+    'startup: first GET /': '/',
+    'startup: first GET /api/charts': '/api/charts'
+}
+
+
+def measure(fn, repeat):
+    """
+    Run fn repeat times for timing, then once more under tracemalloc for peak memory
+
+    An untimed first call absorbs one-off import and warm-up costs. Returns a
+    dict of the min and median wall time in seconds and the peak traced
+    allocation in bytes.
+    """
+    fn()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds_min': min(timings),
+        'seconds_median': statistics.median(timings),
+        'peak_bytes': peak
+    }
+
+
+def fresh_payload(data):
+    """Copy of an ingested payload sharing its table but not its memoized aggregates"""
+    from flight_table import FlightPayload
+    return FlightPayload(data, table=data.table, version=data.version)
+
+
+def churned_payload(data, seed, fraction=0.01):
+    """Raw copy of a payload with a fraction of its flights replaced, like a successive snapshot"""
+    from mock_generator import MockFlightGenerator
+
+    flights = data.get('data') or []
+    replaced = max(1, int(len(flights) * fraction))
+    fresh = MockFlightGenerator(seed + 1).generate(replaced)['data']
+    return {**data, 'data': list(flights[replaced:]) + fresh}
+
+
+def bench_size(size, seed, repeat, benchmarks, done=()):
+    """
+    Run every selected benchmark over one seeded dataset size
+
+    Each result is recorded under the number of flights the benchmark really
+    processed; a (benchmark, size) pair already in done is not run again.
+    """
+    import app as dashboard
+    from config import Config
+    from data_scraper import ENHANCED_MOCK_MAX_FLIGHTS, AdvancedAirlineScraper
+    from flight_table import ingest
+    from http_cache import _compressed_cache
+    from snapshot import SnapshotStore
+
+    scraper = dashboard.scraper
+    advanced = AdvancedAirlineScraper()
+    data = ingest(scraper.get_mock_data(size, seed=seed))
+
+    enhanced_size = min(size, ENHANCED_MOCK_MAX_FLIGHTS)
+
+    # Successive refreshes alternate between the dataset and a copy with 1% of its flights changed
+    churned = churned_payload(data, seed)
+    changed = ingest(churned)
+    alternating = [dict(data), churned]
+
+    def next_payload():
+        alternating.reverse()
+        return alternating[0]
+
+    refreshing = SnapshotStore(fetch=next_payload, interval=24 * 3600)
+
+    def generate_enhanced():
+        random.seed(seed)
+        return advanced._generate_enhanced_mock_data(limit=enhanced_size)
+
+    # Name -> (callable, flights it processes)
+    cases = {
+        'get_mock_data': (lambda: scraper.get_mock_data(size, seed=seed), size),
+        '_generate_enhanced_mock_data': (generate_enhanced, enhanced_size),
+        'ingest': (lambda: ingest(dict(data)), size),
+        'process_data': (lambda: scraper.process_data(fresh_payload(data)), size),
+        'get_market_insights': (lambda: advanced.get_market_insights(fresh_payload(data)), size),
+        'snapshot_insights (1% churn)': (lambda: refreshing._analyze(fresh_payload(changed)), size),
+        'snapshot_refresh (1% churn)': (refreshing.refresh, size)
+    }
+
+    results = []
+    for name, (fn, flights) in cases.items():
+        if (benchmarks and name not in benchmarks) or (name, flights) in done:
+            continue
+        results.append({'benchmark': name, 'size': flights, **measure(fn, repeat)})
+        note = f"  ({flights} flights)" if flights != size else ''
+        print(f"  {name:<30} {results[-1]['seconds_min'] * 1000:>10.1f} ms  "
+              f"{results[-1]['peak_bytes'] / 2**20:>8.1f} MiB{note}", flush=True)
+
+    endpoints = [path for path in ENDPOINTS if not benchmarks or path in benchmarks]
+    if endpoints:
+        client = dashboard.app.test_client()
+        headers = {'Accept-Encoding': 'gzip'}
+        stores = []
+
+        def serve(payload):
+            # Never refreshed during the run; the store replaced is stopped
+            if stores:
+                stores.pop().stop()
+            stores.append(SnapshotStore(fetch=lambda: payload, interval=24 * 3600))
+            dashboard.snapshots = stores[-1]
+            dashboard.chart_cache.clear()
+            _compressed_cache.clear()
+
+        limit = min(size, Config.MAX_FLIGHT_LIMIT)
+        for path in endpoints:
+            query = ENDPOINTS[path].format(limit=limit)
+            url = f'{path}?{query}' if query else path
+            # Only /api/data rows scale with its limit; the rest serve aggregates over every flight
+            served = limit if query else size
+
+            def cold():
+                # A new store over an unanalysed copy recomputes the snapshot insights, as after a refresh
+                serve(fresh_payload(data))
+                return client.get(url, headers=headers)
+
+            def warm():
+                return client.get(url, headers=headers)
+
+            for variant, fn, flights in (('cold', cold, size), ('warm', warm, served)):
+                name = f'GET {path} ({variant})'
+                if (name, flights) in done:
+                    continue
+                if variant == 'warm':
+                    serve(data)
+                results.append({'benchmark': name, 'size': flights, **measure(fn, repeat)})
+                note = f"  ({flights} flights)" if flights != size else ''
+                print(f"  {name:<30} {results[-1]['seconds_min'] * 1000:>10.1f} ms  "
+                      f"{results[-1]['peak_bytes'] / 2**20:>8.1f} MiB{note}", flush=True)
+        stores.pop().stop()
+
+    return results
+
+
+def bench_startup(repeat, benchmarks):
+    """Time a new worker process from import to its first response, as on a cold start"""
+    # Mock data keeps the first snapshot off the network
+    env = dict(os.environ, SNAPSHOT_SOURCE='mock')
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    cases = {name: target for name, target in STARTUP_CASES.items()
+             if not benchmarks or name in benchmarks or 'startup' in benchmarks}
+    if cases:
+        print('Startup (new interpreter per run)', flush=True)
+    results = []
+    for name, target in cases.items():
+        runs = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT, target], capture_output=True,
+                                    text=True, check=True, cwd=cwd, env=env).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        timings = [run['seconds'] for run in runs]
+        results.append({
+            'benchmark': name,
+            'size': 0,
+            'seconds_min': min(timings),
+            'seconds_median': statistics.median(timings),
+            'peak_bytes': max(run['peak_bytes'] for run in runs)
+        })
+        print(f"  {name:<30} {results[-1]['seconds_min'] * 1000:>10.1f} ms  "
+              f"{results[-1]['peak_bytes'] / 2**20:>8.1f} MiB RSS", flush=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(baseline, current, threshold):
+    """
+    Print the change of every benchmark present in both runs
+
+    Returns the list of (benchmark, size, metric, ratio) regressions beyond threshold.
+    """
+    previous = {(row['benchmark'], row['size']): row for row in baseline['results']}
+    regressions = []
+    print(f"\n{'benchmark':<32} {'size':>8} {'time':>8} {'memory':>8}")
+    for row in current['results']:
+        old = previous.get((row['benchmark'], row['size']))
+        if old is None:
+            continue
+        ratios, flag = {}, ''
+        for metric, floor in NOISE_FLOOR.items():
+            ratios[metric] = row[metric] / old[metric] if old[metric] else 1.0
+            if ratios[metric] > 1 + threshold and row[metric] - old[metric] > floor:
+                regressions.append((row['benchmark'], row['size'], metric, ratios[metric]))
+                flag = '  REGRESSION'
+        print(f"{row['benchmark']:<32} {row['size']:>8} {ratios['seconds_min']:>7.2f}x "
+              f"{ratios['peak_bytes']:>7.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard hot paths over seeded mock data')
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')],
+                        default=DEFAULT_SIZES, help='comma-separated dataset sizes (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='timed runs per benchmark')
+    parser.add_argument('--only', default='',
+                        help="comma-separated benchmark names, endpoint paths or 'startup' to run")
+    parser.add_argument('--output', default='benchmark_results.json', help='where to write the JSON results')
+    parser.add_argument('--compare', metavar='BASELINE', help='results file to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='fractional slowdown or memory growth flagged as a regression')
+    args = parser.parse_args()
+
+    benchmarks = {name for name in args.only.split(',') if name}
+    results = bench_startup(args.repeat, benchmarks)
+    for size in args.sizes:
+        print(f"Dataset of {size} flights (seed {args.seed})", flush=True)
+        done = {(row['benchmark'], row['size']) for row in results}
+        results.extend(bench_size(size, args.seed, args.repeat, benchmarks, done))
+
+    report = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print('\nNo regressions')
+
+
+if __name__ == '__main__':
+    main()
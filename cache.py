@@ -0,0 +1,107 @@
+"""
+Caching utilities for Airline Data Analytics Dashboard
+Provides a thread-safe TTL cache with LRU eviction for upstream responses
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def flight_query_key(route_from=None, route_to=None, limit=50):
+    """Normalize a flight query so equivalent requests share one cache entry"""
+    route_from = (route_from or '').strip().upper() or None
+    route_to = (route_to or '').strip().upper() or None
+    return (route_from, route_to, int(limit))
+
+
+def fingerprint(obj):
+    """Stable content hash of a JSON-compatible object, used as a dataset version"""
+    encoded = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+class TTLCache:
+    """Bounded in-memory cache with per-entry expiry and LRU eviction"""
+
+    def __init__(self, ttl=300, maxsize=128, single_flight=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.single_flight = single_flight
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full"""
+        # A ttl of None keeps entries until they are evicted by size
+        expires_at = float('inf') if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, factory):
+        """Return the cached value for key, calling factory() to fill it on a miss"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        if self.single_flight is None:
+            value = factory()
+            self.set(key, value)
+            return value
+        return self.single_flight.do(key, lambda: self._fill(key, factory))
+
+    def _fill(self, key, factory):
+        """Fill key once per coalesced miss, unless a concurrent caller already did"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+        value = factory()
+        self.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry and reset the hit/miss counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and occupancy for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.single_flight.coalesced if self.single_flight else 0,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
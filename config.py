@@ -1,12 +1,30 @@
 """
 Configuration file for Airline Data Analytics Dashboard
 """
+import hashlib
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+def _deployment_dir(name, shared_memory=False):
+    """
+    Default directory for state shared by the workers of this deployment
+
+    Namespaced by user, checkout and data source, so that unrelated instances
+    on one host, e.g. a development server beside gunicorn, never share locks,
+    snapshots or metrics.
+    """
+    identity = [os.path.dirname(os.path.abspath(__file__)),
+                os.environ.get('SNAPSHOT_SOURCE', ''), os.environ.get('AVIATIONSTACK_BASE_URL', '')]
+    deployment = hashlib.sha1('\0'.join(identity).encode('utf-8')).hexdigest()[:12]
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', '')
+    base = '/dev/shm' if shared_memory and os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    # Directly in the sticky base, so no other user can own a parent and swap the directory out
+    return os.path.join(base, f'airline-dashboard-{name}-{user}-{deployment}')
+
 class Config:
     """Base configuration class"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-here'
@@ -14,14 +32,86 @@ class Config:
     OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY') or ''
     
     # API Configuration
-    AVIATIONSTACK_BASE_URL = 'http://api.aviationstack.com/v1'
+    AVIATIONSTACK_BASE_URL = os.environ.get('AVIATIONSTACK_BASE_URL') or 'http://api.aviationstack.com/v1'
+    
+    # Upstream HTTP Client
+    UPSTREAM_POOL_SIZE = 10
+    UPSTREAM_CONNECT_TIMEOUT = 3.05  # seconds
+    UPSTREAM_READ_TIMEOUT = 10  # seconds
+    UPSTREAM_RETRIES = 2
+    UPSTREAM_BACKOFF = 0.5  # seconds, doubled on each retry
+    UPSTREAM_BACKOFF_JITTER = 0.25  # seconds of random jitter added to each backoff
+    
+    # Bulk Fetch Configuration
+    BULK_FETCH_WORKERS = 4  # concurrent page requests, kept below UPSTREAM_POOL_SIZE
+    BULK_MAX_FLIGHTS = 5000
     
     # Data Configuration
     DEFAULT_FLIGHT_LIMIT = 50
     MAX_FLIGHT_LIMIT = 100
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+    SUMMARY_PAGE_SIZE = 25  # table rows sent with the dashboard's summary view
+    MAX_EXPORT_FLIGHT_LIMIT = 1000000  # flights per NDJSON export, which streams the whole snapshot by default
+    MOCK_DATA_SEED = int(os.environ['MOCK_DATA_SEED']) if os.environ.get('MOCK_DATA_SEED') else None
     
     # Cache Configuration
     CACHE_TIMEOUT = 300  # 5 minutes
+    CACHE_MAX_ENTRIES = 128
+    
+    # Request Coalescing (one upstream fetch per query across all local workers)
+    SINGLE_FLIGHT_DIR = os.environ.get('SINGLE_FLIGHT_DIR') or _deployment_dir('singleflight')
+    SINGLE_FLIGHT_ERROR_TTL = 5  # seconds a failed fetch is reported to other workers instead of retried
+    CHART_CACHE_ENTRIES = 16
+    
+    # JSON Serialization
+    JSON_SERIALIZER = os.environ.get('JSON_SERIALIZER') or 'auto'  # 'auto', 'orjson' or 'stdlib'
+    
+    # Response Compression
+    COMPRESSION_MIN_SIZE = 1024  # bytes
+    COMPRESSED_CACHE_ENTRIES = 64
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5
+    
+    # Snapshot Configuration
+    SNAPSHOT_SOURCE = os.environ.get('SNAPSHOT_SOURCE') or 'aviationstack'
+    SNAPSHOT_FLIGHT_LIMIT = 100
+    SNAPSHOT_BULK_FLIGHT_LIMIT = int(os.environ.get('SNAPSHOT_BULK_FLIGHT_LIMIT') or BULK_MAX_FLIGHTS)  # 'aviationstack_bulk' only
+    SNAPSHOT_REFRESH_INTERVAL = 60  # seconds
+    SNAPSHOT_VIEW_CACHE_ENTRIES = 64
+    TIMESTAMP_CACHE_ENTRIES = 200000  # distinct parsed timestamp strings remembered between tables
+    
+    # Shared Snapshot (one worker publishes a memory-mapped snapshot that all workers read)
+    SHARED_SNAPSHOT_DIR = os.environ.get(
+        'SHARED_SNAPSHOT_DIR', _deployment_dir('snapshot', shared_memory=True)
+    )  # set to an empty string to keep a private snapshot per worker
+    SHARED_SNAPSHOT_POLL_INTERVAL = 1  # seconds between checks for a newer published snapshot
+    
+    # Flight History (one SQLite partition per flight_date)
+    HISTORY_DIR = os.environ.get('HISTORY_DIR', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'history'
+    ))  # set to an empty string to disable recording
+    HISTORY_RETENTION_DAYS = 90
+    HISTORY_COMPACT_INTERVAL = 3600  # seconds
+    HISTORY_BUSY_TIMEOUT = 10  # seconds to wait on another worker's write
+    HISTORY_DEFAULT_DAYS = 7
+    HISTORY_MAX_RANGE_DAYS = 31
+    HISTORY_CACHE_TTL = 60  # seconds a range's insights are reused before re-reading its partitions
+    HISTORY_CACHE_ENTRIES = 16
+    
+    # Metrics (each worker's counters are merged through a shared directory on scrape)
+    METRICS_DIR = os.environ.get(
+        'METRICS_DIR', _deployment_dir('metrics', shared_memory=True)
+    )  # set to an empty string to report only the worker that answers the scrape
+    METRICS_FLUSH_INTERVAL = 1  # seconds between writes of a worker's changed metrics
+    
+    # Request Profiling (off unless a token or sample rate is set)
+    PROFILE_DIR = os.environ.get('PROFILE_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'data', 'profiles'
+    )
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN') or ''  # profiles a request passed ?profile=<token>
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE') or 0)  # fraction of requests profiled
+    PROFILE_MAX_FILES = 50  # newest profiles kept; older ones are deleted
     
     # Popular airports for demo purposes
     POPULAR_AIRPORTS = {
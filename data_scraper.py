@@ -4,51 +4,109 @@ Includes web scraping capabilities and multiple data sources
 """
 
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 import json
 import time
 import random
+import threading
 from datetime import datetime, timedelta
 from config import Config
+from cache import TTLCache, flight_query_key
+from analytics import ON_TIME_STATUSES, aggregate_data, top_counts
+from flight_table import ingest
+from http_client import shared_upstream_client
+from metrics import timed
+from singleflight import CoalescedError, SingleFlight
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# _generate_enhanced_mock_data never generates more flights than this, whatever the limit
+ENHANCED_MOCK_MAX_FLIGHTS = 100
+
 class AdvancedAirlineScraper:
     """Advanced scraper with multiple data sources and web scraping capabilities"""
     
     def __init__(self):
         self.config = Config()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self._cache = None
+        self._cache_lock = threading.Lock()
+    
+    @property
+    def cache(self):
+        """
+        Response cache shared across workers through a SingleFlight
         
-    def get_flight_data_with_scraping(self, source='aviationstack', **kwargs):
+        Created on the first cached fetch, so a scraper used only for
+        uncached refreshes or analysis never sets up the lock directory.
+        """
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = TTLCache(
+                    ttl=self.config.CACHE_TIMEOUT, maxsize=self.config.CACHE_MAX_ENTRIES,
+                    single_flight=SingleFlight('aviationstack', self.config.SINGLE_FLIGHT_DIR,
+                                               self.config.CACHE_TIMEOUT, self.config.SINGLE_FLIGHT_ERROR_TTL)
+                )
+            return self._cache
+    
+    @property
+    def client(self):
+        """Pooled upstream client, recreated per worker process after a fork"""
+        return shared_upstream_client()
+    
+    @property
+    def session(self):
+        """Underlying requests.Session of the shared upstream client"""
+        return self.client.session
+        
+    def get_flight_data_with_scraping(self, source='aviationstack', fallback_to_mock=True, use_cache=True, **kwargs):
         """
         Get flight data from multiple sources including web scraping
         
         Args:
-            source: Data source ('aviationstack', 'mock', 'scrape')
+            source: Data source ('aviationstack', 'aviationstack_bulk', 'mock', 'scrape')
+            fallback_to_mock: Return mock data on upstream failure instead of raising; it holds
+                at most ENHANCED_MOCK_MAX_FLIGHTS flights, even for a bulk limit of thousands
+            use_cache: Reuse a response fetched within CACHE_TIMEOUT, here or by another worker;
+                a periodic refresher passes False so that every refresh reaches the upstream
             **kwargs: Additional parameters for filtering
+        
+        Every source returns an ingested payload, so analyses of it reuse one flight table.
         """
         try:
             if source == 'aviationstack':
-                return self._get_aviationstack_data(**kwargs)
+                fetch = self._get_aviationstack_data if use_cache else self._fetch_aviationstack_data
+                return ingest(fetch(fallback_to_mock=fallback_to_mock, **kwargs))
+            elif source == 'aviationstack_bulk':
+                fetch = self._get_aviationstack_bulk_data if use_cache else self._fetch_aviationstack_bulk_data
+                return ingest(fetch(fallback_to_mock=fallback_to_mock, **kwargs))
             elif source == 'scrape':
-                return self._scrape_public_data(**kwargs)
+                return ingest(self._scrape_public_data(**kwargs))
             else:
-                return self._generate_enhanced_mock_data(**kwargs)
+                return ingest(self._generate_enhanced_mock_data(**kwargs))
         except Exception as e:
             logger.error(f"Error fetching data from {source}: {str(e)}")
-            return self._generate_enhanced_mock_data(**kwargs)
+            if not fallback_to_mock:
+                raise
+            return ingest(self._generate_enhanced_mock_data(**kwargs))
+    
+    def _get_aviationstack_data(self, route_from=None, route_to=None, limit=50, fallback_to_mock=True):
+        """Fetch data from Aviationstack API, reusing cached responses within the TTL"""
+        key = flight_query_key(route_from, route_to, min(limit, self.config.MAX_FLIGHT_LIMIT))
+        # Only real upstream responses are cached and shared; mock data stands in per call
+        try:
+            return self.cache.get_or_set(
+                key, lambda: ingest(self._fetch_aviationstack_data(*key, fallback_to_mock=False))
+            )
+        except (requests.exceptions.RequestException, CoalescedError) as e:
+            logger.warning(f"API request failed: {str(e)}")
+            if not fallback_to_mock:
+                raise
+            return self._generate_enhanced_mock_data(route_from, route_to, limit)
     
-    def _get_aviationstack_data(self, route_from=None, route_to=None, limit=50):
+    def _fetch_aviationstack_data(self, route_from=None, route_to=None, limit=50, fallback_to_mock=True):
         """Fetch data from Aviationstack API"""
-        url = f"{self.config.AVIATIONSTACK_BASE_URL}/flights"
         params = {
             'access_key': self.config.AVIATIONSTACK_API_KEY,
             'limit': min(limit, self.config.MAX_FLIGHT_LIMIT)
@@ -60,11 +118,45 @@ class AdvancedAirlineScraper:
             params['arr_iata'] = route_to.upper()
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_json('flights', params)
         except requests.exceptions.RequestException as e:
             logger.warning(f"API request failed: {str(e)}")
+            if not fallback_to_mock:
+                raise
+            return self._generate_enhanced_mock_data(route_from, route_to, limit)
+    
+    def _get_aviationstack_bulk_data(self, route_from=None, route_to=None, limit=None, fallback_to_mock=True):
+        """Fetch every page of a query from Aviationstack, reusing cached snapshots within the TTL"""
+        limit = min(limit or self.config.BULK_MAX_FLIGHTS, self.config.BULK_MAX_FLIGHTS)
+        key = ('bulk',) + flight_query_key(route_from, route_to, limit)
+        # Only real upstream responses are cached and shared; mock data stands in per call
+        try:
+            return self.cache.get_or_set(
+                key, lambda: ingest(self._fetch_aviationstack_bulk_data(*key[1:], fallback_to_mock=False))
+            )
+        except (requests.exceptions.RequestException, ValueError, CoalescedError) as e:
+            logger.warning(f"Bulk API request failed: {str(e)}")
+            if not fallback_to_mock:
+                raise
+            return self._generate_enhanced_mock_data(route_from, route_to, limit)
+    
+    def _fetch_aviationstack_bulk_data(self, route_from=None, route_to=None, limit=None, fallback_to_mock=True):
+        """Fetch all offset pages of a query concurrently and merge them into one snapshot"""
+        limit = min(limit or self.config.BULK_MAX_FLIGHTS, self.config.BULK_MAX_FLIGHTS)
+        params = {'access_key': self.config.AVIATIONSTACK_API_KEY}
+        
+        if route_from:
+            params['dep_iata'] = route_from.upper()
+        if route_to:
+            params['arr_iata'] = route_to.upper()
+        
+        try:
+            return self.client.get_all_pages('flights', params, page_size=self.config.MAX_FLIGHT_LIMIT,
+                                             max_records=limit)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Bulk API request failed: {str(e)}")
+            if not fallback_to_mock:
+                raise
             return self._generate_enhanced_mock_data(route_from, route_to, limit)
     
     def _scrape_public_data(self, **kwargs):
@@ -76,6 +168,7 @@ class AdvancedAirlineScraper:
         logger.info("Web scraping functionality - returning mock data for demo")
         return self._generate_enhanced_mock_data(**kwargs)
     
+    @timed('mock_generate')
     def _generate_enhanced_mock_data(self, route_from=None, route_to=None, limit=50):
         """Generate enhanced mock data with realistic patterns"""
         flights = []
@@ -103,8 +196,11 @@ class AdvancedAirlineScraper:
         
         flight_statuses = ['scheduled', 'active', 'landed', 'cancelled', 'incident', 'diverted']
         
+        if limit > ENHANCED_MOCK_MAX_FLIGHTS:
+            logger.warning(f"Mock data is capped at {ENHANCED_MOCK_MAX_FLIGHTS} of the {limit} flights requested")
+        
         # Generate flights
-        for i in range(min(limit, 100)):
+        for i in range(min(limit, ENHANCED_MOCK_MAX_FLIGHTS)):
             # Select route
             if route_from and route_to:
                 dep_iata, arr_iata = route_from.upper(), route_to.upper()
@@ -198,197 +294,130 @@ class AdvancedAirlineScraper:
         }
     
     def get_market_insights(self, data):
-        """Generate advanced market insights from flight data"""
+        """
+        Generate advanced market insights from flight data
+        
+        A raw payload is flattened on every call; pass the ingested payload
+        get_flight_data_with_scraping returns to reuse its table and tallies.
+        """
         if not data or 'data' not in data:
             return {}
         
-        flights = data['data']
-        df = pd.DataFrame(flights)
+        # Every section reads the same base tallies, computed once per dataset
+        aggregates = aggregate_data(data)
         
         insights = {
-            'market_analysis': self._analyze_market_trends(flights),
-            'route_performance': self._analyze_route_performance(flights),
-            'airline_metrics': self._analyze_airline_metrics(flights),
-            'operational_insights': self._analyze_operational_data(flights),
-            'temporal_patterns': self._analyze_temporal_patterns(flights),
-            'recommendations': self._generate_recommendations(flights)
+            'market_analysis': self._analyze_market_trends(aggregates),
+            'route_performance': self._analyze_route_performance(aggregates),
+            'airline_metrics': self._analyze_airline_metrics(aggregates),
+            'operational_insights': self._analyze_operational_data(aggregates),
+            'temporal_patterns': self._analyze_temporal_patterns(aggregates),
+            'recommendations': self._generate_recommendations(aggregates)
         }
         
         return insights
     
-    def _analyze_market_trends(self, flights):
+    def _analyze_market_trends(self, aggregates):
         """Analyze market trends and demand patterns"""
         try:
-            # Route popularity
-            routes = [f"{f['departure']['iata']}-{f['arrival']['iata']}" for f in flights 
-                     if f.get('departure') and f.get('arrival')]
-            route_counts = pd.Series(routes).value_counts()
-            
-            # Airline market share
-            airlines = [f['airline']['name'] for f in flights if f.get('airline')]
-            airline_counts = pd.Series(airlines).value_counts()
-            
             return {
-                'top_routes': route_counts.head(10).to_dict(),
-                'market_leaders': airline_counts.head(5).to_dict(),
-                'market_concentration': len(airline_counts),
-                'route_diversity': len(route_counts)
+                'top_routes': top_counts(aggregates.routes, 10),
+                'market_leaders': top_counts(aggregates.airlines, 5),
+                'market_concentration': len(aggregates.airlines),
+                'route_diversity': len(aggregates.routes)
             }
         except Exception as e:
             logger.error(f"Error analyzing market trends: {str(e)}")
             return {}
     
-    def _analyze_route_performance(self, flights):
+    def _analyze_route_performance(self, aggregates):
         """Analyze individual route performance"""
         try:
-            route_data = {}
-            for flight in flights:
-                if not (flight.get('departure') and flight.get('arrival')):
-                    continue
-                    
-                route = f"{flight['departure']['iata']}-{flight['arrival']['iata']}"
-                if route not in route_data:
-                    route_data[route] = {
-                        'flights': 0,
-                        'airlines': set(),
-                        'on_time_rate': 0,
-                        'avg_delay': 0
-                    }
-                
-                route_data[route]['flights'] += 1
-                route_data[route]['airlines'].add(flight['airline']['name'])
-                
-                # Calculate on-time performance (mock calculation)
-                if flight['flight_status'] in ['scheduled', 'active', 'landed']:
-                    route_data[route]['on_time_rate'] += 1
-            
-            # Process route data
-            for route in route_data:
-                route_data[route]['airlines'] = len(route_data[route]['airlines'])
-                route_data[route]['on_time_rate'] = round(
-                    route_data[route]['on_time_rate'] / route_data[route]['flights'] * 100, 2
-                )
+            airlines = aggregates.distinct('route_airlines', 0)
+            on_time = aggregates.tallies['route_on_time']
             
-            return dict(sorted(route_data.items(), 
-                              key=lambda x: x[1]['flights'], reverse=True)[:10])
+            return {
+                route: {
+                    'flights': flights,
+                    'airlines': airlines.get(route, 0),
+                    'on_time_rate': round(on_time.get(route, 0) / flights * 100, 2),
+                    'avg_delay': 0
+                }
+                for route, flights in top_counts(aggregates.routes, 10).items()
+            }
         except Exception as e:
             logger.error(f"Error analyzing route performance: {str(e)}")
             return {}
     
-    def _analyze_airline_metrics(self, flights):
+    def _analyze_airline_metrics(self, aggregates):
         """Analyze airline-specific metrics"""
         try:
-            airline_metrics = {}
-            for flight in flights:
-                if not flight.get('airline'):
-                    continue
-                    
-                airline = flight['airline']['name']
-                if airline not in airline_metrics:
-                    airline_metrics[airline] = {
-                        'total_flights': 0,
-                        'routes_served': set(),
-                        'aircraft_types': set(),
-                        'on_time_performance': 0
-                    }
-                
-                airline_metrics[airline]['total_flights'] += 1
-                
-                if flight.get('departure') and flight.get('arrival'):
-                    route = f"{flight['departure']['iata']}-{flight['arrival']['iata']}"
-                    airline_metrics[airline]['routes_served'].add(route)
-                
-                if flight.get('aircraft'):
-                    airline_metrics[airline]['aircraft_types'].add(flight['aircraft']['iata'])
-                
-                # Mock on-time performance
-                if flight['flight_status'] in ['scheduled', 'active', 'landed']:
-                    airline_metrics[airline]['on_time_performance'] += 1
+            routes = aggregates.distinct('route_airlines', 1)
+            aircraft = aggregates.distinct('airline_aircraft', 0)
+            on_time = aggregates.tallies['airline_on_time']
             
-            # Process metrics
-            for airline in airline_metrics:
-                metrics = airline_metrics[airline]
-                metrics['routes_served'] = len(metrics['routes_served'])
-                metrics['aircraft_types'] = len(metrics['aircraft_types'])
-                metrics['on_time_performance'] = round(
-                    metrics['on_time_performance'] / metrics['total_flights'] * 100, 2
-                )
-            
-            return dict(sorted(airline_metrics.items(), 
-                              key=lambda x: x[1]['total_flights'], reverse=True)[:5])
+            return {
+                airline: {
+                    'total_flights': flights,
+                    'routes_served': routes.get(airline, 0),
+                    'aircraft_types': aircraft.get(airline, 0),
+                    'on_time_performance': round(on_time.get(airline, 0) / flights * 100, 2)
+                }
+                for airline, flights in top_counts(aggregates.airlines, 5).items()
+            }
         except Exception as e:
             logger.error(f"Error analyzing airline metrics: {str(e)}")
             return {}
     
-    def _analyze_operational_data(self, flights):
+    def _analyze_operational_data(self, aggregates):
         """Analyze operational insights"""
         try:
-            # Airport utilization
-            airports = []
-            for flight in flights:
-                if flight.get('departure'):
-                    airports.append(flight['departure']['iata'])
-                if flight.get('arrival'):
-                    airports.append(flight['arrival']['iata'])
-            
-            airport_counts = pd.Series(airports).value_counts()
-            
             # Flight status distribution
-            statuses = [f['flight_status'] for f in flights if f.get('flight_status')]
-            status_counts = pd.Series(statuses).value_counts()
+            status_counts = aggregates.statuses
+            total_statuses = int(status_counts.sum())
+            on_time = status_counts[status_counts.index.isin(ON_TIME_STATUSES)].sum()
             
             return {
-                'busiest_airports': airport_counts.head(10).to_dict(),
-                'flight_status_distribution': status_counts.to_dict(),
-                'operational_efficiency': round(
-                    (status_counts.get('scheduled', 0) + status_counts.get('active', 0) + 
-                     status_counts.get('landed', 0)) / len(statuses) * 100, 2
-                ) if statuses else 0
+                'busiest_airports': top_counts(aggregates.airports, 10),
+                'flight_status_distribution': top_counts(status_counts, len(status_counts)),
+                'operational_efficiency': round(on_time / total_statuses * 100, 2) if total_statuses else 0
             }
         except Exception as e:
             logger.error(f"Error analyzing operational data: {str(e)}")
             return {}
     
-    def _analyze_temporal_patterns(self, flights):
+    def _analyze_temporal_patterns(self, aggregates):
         """Analyze temporal patterns in flight data"""
         try:
-            # Extract hours from departure times
-            departure_hours = []
-            for flight in flights:
-                if flight.get('departure') and flight['departure'].get('scheduled'):
-                    try:
-                        dt = datetime.fromisoformat(flight['departure']['scheduled'].replace('Z', '+00:00'))
-                        departure_hours.append(dt.hour)
-                    except:
-                        continue
+            hour_counts = aggregates.hours.sort_index()
+            local_hour_counts = aggregates.local_hours.sort_index()
             
-            if not departure_hours:
+            if hour_counts.empty:
                 return {}
             
-            hour_counts = pd.Series(departure_hours).value_counts().sort_index()
-            
             # Identify peak hours
             peak_hours = hour_counts.nlargest(3).index.tolist()
             
             return {
-                'hourly_distribution': hour_counts.to_dict(),
+                'hourly_distribution': top_counts(hour_counts, len(hour_counts)),
                 'peak_hours': peak_hours,
-                'busiest_hour': hour_counts.idxmax() if not hour_counts.empty else None,
-                'quietest_hour': hour_counts.idxmin() if not hour_counts.empty else None
+                'busiest_hour': hour_counts.idxmax(),
+                'quietest_hour': hour_counts.idxmin(),
+                # The same departures by hour at each departure airport's local time
+                'local_hourly_distribution': top_counts(local_hour_counts, len(local_hour_counts)),
+                'local_peak_hours': local_hour_counts.nlargest(3).index.tolist()
             }
         except Exception as e:
             logger.error(f"Error analyzing temporal patterns: {str(e)}")
             return {}
     
-    def _generate_recommendations(self, flights):
+    def _generate_recommendations(self, aggregates):
         """Generate actionable recommendations based on data analysis"""
         try:
             recommendations = []
             
             # Route recommendations
-            routes = [f"{f['departure']['iata']}-{f['arrival']['iata']}" for f in flights 
-                     if f.get('departure') and f.get('arrival')]
-            route_counts = pd.Series(routes).value_counts()
+            route_counts = aggregates.routes
             
             if not route_counts.empty:
                 top_route = route_counts.index[0]
@@ -400,8 +429,7 @@ class AdvancedAirlineScraper:
                 })
             
             # Airline recommendations
-            airlines = [f['airline']['name'] for f in flights if f.get('airline')]
-            airline_counts = pd.Series(airlines).value_counts()
+            airline_counts = aggregates.airlines
             
             if not airline_counts.empty:
                 recommendations.append({
@@ -412,8 +440,9 @@ class AdvancedAirlineScraper:
                 })
             
             # Operational recommendations
-            statuses = [f['flight_status'] for f in flights if f.get('flight_status')]
-            cancelled_rate = len([s for s in statuses if s == 'cancelled']) / len(statuses) * 100 if statuses else 0
+            total_statuses = int(aggregates.statuses.sum())
+            cancelled = aggregates.tallies['statuses'].get('cancelled', 0)
+            cancelled_rate = cancelled / total_statuses * 100 if total_statuses else 0
             
             if cancelled_rate > 5:
                 recommendations.append({
@@ -0,0 +1,107 @@
+"""
+Inverted Indexes for Airline Data Analytics Dashboard
+Per-snapshot posting lists answering filtered queries by row-id intersection
+"""
+
+import numpy as np
+import pandas as pd
+
+# Query filter name -> the flight table column it is indexed from
+INDEXED_FILTERS = {
+    'from': 'dep_iata',
+    'to': 'arr_iata',
+    'airline': 'airline_iata',
+    'status': 'flight_status',
+    'hour': 'dep_hour'
+}
+
+
+def _postings(series):
+    """Map each observed value of a column to the sorted row ids holding it"""
+    codes, uniques = pd.factorize(series)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))))
+    # Missing values sort first under code -1; skip past them
+    order = order[len(codes) - bounds[-1]:]
+    return {
+        value: order[bounds[position]:bounds[position + 1]]
+        for position, value in enumerate(uniques.tolist())
+    }
+
+
+def _intersect(rows, other, size):
+    """Ids of the sorted array rows also present in the sorted, longer array other"""
+    if len(rows) * 16 < len(other):
+        # Few ids: one binary search each beats touching every id in other
+        positions = np.searchsorted(other, rows)
+        found = positions < len(other)
+        found[found] = other[positions[found]] == rows[found]
+        return rows[found]
+    present = np.zeros(size, dtype=bool)
+    present[other] = True
+    return rows[present[rows]]
+
+
+class FlightIndex:
+    """Row ids per departure airport, arrival airport, airline, status and departure hour"""
+
+    def __init__(self, table):
+        self.size = len(table)
+        columns = {
+            'dep_iata': table['dep_iata'],
+            'arr_iata': table['arr_iata'],
+            'airline_iata': table['airline_iata'],
+            'flight_status': table['flight_status'],
+            'dep_hour': table['dep_scheduled'].dt.hour.astype('Int64')
+        }
+        self._postings = {name: _postings(series) for name, series in columns.items()}
+
+    def lookup(self, column, value):
+        """Sorted row ids whose column equals value"""
+        return self._postings[column].get(value, np.empty(0, dtype=np.intp))
+
+    def select(self, **filters):
+        """
+        Sorted row ids matching every given filter
+
+        Args:
+            filters: Indexed column name -> required value; None values are ignored
+        """
+        postings = [self.lookup(column, value) for column, value in filters.items() if value is not None]
+        if not postings:
+            return np.arange(self.size)
+        # Intersect from the rarest value up, so each step is bounded by the smallest list
+        postings.sort(key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            if not len(rows):
+                break
+            rows = _intersect(rows, other, self.size)
+        return rows
+
+
+def parse_filters(args):
+    """
+    Read indexed filters from query arguments, normalized to how they are stored
+
+    Returns a dict of indexed column name -> value. Raises ValueError for an
+    hour outside 0-23.
+    """
+    filters = {}
+    for name, column in INDEXED_FILTERS.items():
+        value = (args.get(name) or '').strip()
+        if not value:
+            continue
+        if name == 'hour':
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError("'hour' must be an integer")
+            if not 0 <= value <= 23:
+                raise ValueError("'hour' must be between 0 and 23")
+        elif name == 'status':
+            value = value.lower()
+        else:
+            value = value.upper()
+        filters[column] = value
+    return filters
@@ -0,0 +1,179 @@
+"""
+Columnar Flight Table for Airline Data Analytics Dashboard
+Flattens Aviationstack payloads once into a typed pandas DataFrame
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from config import Config
+from serialization import dumps
+
+# Low-cardinality string columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = [
+    'flight_status', 'dep_iata', 'arr_iata', 'route', 'dep_timezone', 'arr_timezone',
+    'airline_name', 'airline_iata', 'aircraft_iata'
+]
+
+# ISO-8601 timestamps parsed to timezone-aware datetime64
+TIMESTAMP_COLUMNS = [
+    'dep_scheduled', 'dep_estimated', 'dep_actual',
+    'arr_scheduled', 'arr_estimated', 'arr_actual'
+]
+
+NUMERIC_COLUMNS = ['dep_delay', 'arr_delay']
+
+COLUMNS = ['flight_date', 'flight_iata'] + CATEGORICAL_COLUMNS + TIMESTAMP_COLUMNS + NUMERIC_COLUMNS
+
+# Scheduled departure hour in the departure airport's own time zone
+LOCAL_HOUR_COLUMN = 'dep_local_hour'
+
+_NAT = np.iinfo(np.int64).min
+
+# Distinct ISO-8601 strings already parsed, as UTC microseconds; successive
+# payloads repeat most timestamps, so rebuilding a table rarely parses anything
+_parsed_timestamps = {}
+
+
+def parse_timestamps(columns):
+    """
+    Parse several lists of ISO-8601 strings to UTC datetimes in a single pass
+
+    All columns are dictionary-encoded together and each distinct string
+    is parsed at most once, then remembered across calls.
+    """
+    global _parsed_timestamps
+    codes, uniques = pd.factorize(np.concatenate([np.asarray(column, dtype=object) for column in columns]))
+
+    # The cache is replaced rather than cleared, so concurrent builds never see it shrink
+    cache = _parsed_timestamps
+    unseen = [value for value in uniques if value not in cache]
+    if unseen:
+        if len(cache) + len(unseen) > Config.TIMESTAMP_CACHE_ENTRIES:
+            cache = {}
+            unseen = uniques.tolist()
+        parsed = pd.to_datetime(unseen, utc=True, format='ISO8601', errors='coerce').as_unit('us')
+        cache.update(zip(unseen, parsed.asi8.tolist()))
+        _parsed_timestamps = cache
+
+    micros = np.fromiter((cache[value] for value in uniques), dtype=np.int64, count=len(uniques))
+    values = np.where(codes >= 0, micros[codes], _NAT).view('datetime64[us]')
+
+    parsed_columns = []
+    start = 0
+    for column in columns:
+        parsed_columns.append(pd.to_datetime(values[start:start + len(column)], utc=True))
+        start += len(column)
+    return parsed_columns
+
+
+def local_hours(timestamps, timezones):
+    """Hour of each timestamp in its own IANA time zone, converted per zone; NaN where unknown"""
+    hours = np.full(len(timestamps), np.nan)
+    # A bare DatetimeIndex avoids the Series indexing and accessor overhead paid once per zone
+    instants = pd.DatetimeIndex(timestamps)
+    for zone, positions in timezones.groupby(timezones, observed=True, sort=False).indices.items():
+        try:
+            local = instants[positions].tz_convert(zone)
+        except (KeyError, ValueError):
+            # Unknown zone names are left without a local hour
+            continue
+        hours[positions] = local.hour.to_numpy(dtype=float, na_value=np.nan)
+    return hours
+
+
+def _categorical(values):
+    """Dictionary-encode a list of strings; factorizing first is several times faster than pd.Categorical"""
+    codes, categories = pd.factorize(np.asarray(values, dtype=object), sort=True)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _field(records, key):
+    """Column of one key across a list of records, None where it is missing"""
+    return [record.get(key) for record in records]
+
+
+def build_flight_table(flights):
+    """Flatten a list of nested flight records into a columnar table"""
+    # Each nested object is looked up once, then every column is one comprehension over it
+    empty = {}
+    departures = [flight.get('departure') or empty for flight in flights]
+    arrivals = [flight.get('arrival') or empty for flight in flights]
+    airlines = [flight.get('airline') or empty for flight in flights]
+    aircraft = [flight.get('aircraft') or empty for flight in flights]
+
+    columns = {
+        'flight_date': _field(flights, 'flight_date'),
+        'flight_iata': [(flight.get('flight') or empty).get('iata') for flight in flights],
+        'flight_status': _field(flights, 'flight_status'),
+        'dep_iata': _field(departures, 'iata'),
+        'arr_iata': _field(arrivals, 'iata'),
+        'dep_timezone': _field(departures, 'timezone'),
+        'arr_timezone': _field(arrivals, 'timezone'),
+        'airline_name': _field(airlines, 'name'),
+        'airline_iata': _field(airlines, 'iata'),
+        'aircraft_iata': _field(aircraft, 'iata')
+    }
+    columns['route'] = [f"{dep_iata}-{arr_iata}" if departure and arrival else None
+                        for departure, arrival, dep_iata, arr_iata
+                        in zip(departures, arrivals, columns['dep_iata'], columns['arr_iata'])]
+    for prefix, records in (('dep', departures), ('arr', arrivals)):
+        for key in ('scheduled', 'estimated', 'actual', 'delay'):
+            columns[f'{prefix}_{key}'] = _field(records, key)
+
+    # Few distinct dates repeat across every flight, so each is parsed once
+    date_codes, dates = pd.factorize(np.asarray(columns['flight_date'], dtype=object))
+    parsed_dates = pd.to_datetime(dates, format='%Y-%m-%d', errors='coerce')
+
+    fields = {
+        'flight_date': parsed_dates.take(date_codes, allow_fill=True, fill_value=pd.NaT),
+        'flight_iata': pd.Series(columns['flight_iata'], dtype=object)
+    }
+    for name in CATEGORICAL_COLUMNS:
+        fields[name] = _categorical(columns[name])
+    fields.update(zip(TIMESTAMP_COLUMNS, parse_timestamps([columns[name] for name in TIMESTAMP_COLUMNS])))
+    fields[LOCAL_HOUR_COLUMN] = local_hours(fields['dep_scheduled'], pd.Series(fields['dep_timezone']))
+    for name in NUMERIC_COLUMNS:
+        fields[name] = pd.to_numeric(pd.Series(columns[name], dtype=object), errors='coerce')
+
+    # Assembled in one step: inserting column by column copies the block layout each time
+    return pd.DataFrame(fields)
+
+
+def content_version(payload):
+    """
+    Content hash of a payload, used as its dataset version
+
+    Hashes the compact encoding the fast serializer produces, in the payload's
+    own key order: re-encoding the whole tree with sorted keys cost most of an
+    ingest. Upstream responses keep a stable key order, and a reordering could
+    only cost a spurious cache miss, never a wrong match.
+    """
+    return hashlib.sha1(dumps(payload)).hexdigest()
+
+
+class FlightPayload(dict):
+    """Aviationstack response carrying its flight table and content version"""
+
+    def __init__(self, payload, table=None, version=None):
+        super().__init__(payload)
+        self.table = table if table is not None else build_flight_table(self.get('data') or [])
+        self.version = version or content_version(payload)
+        # FlightAggregates over table, filled in on first use by analytics.aggregate_data
+        self.aggregates = None
+
+
+def ingest(payload):
+    """Flatten a fetched payload once so every later analysis reuses its table"""
+    if isinstance(payload, FlightPayload) or not payload:
+        return payload
+    return FlightPayload(payload)
+
+
+def as_table(data):
+    """Return the flight table for a payload, flattening it if it was not ingested"""
+    if isinstance(data, FlightPayload):
+        return data.table
+    return build_flight_table(data.get('data') or [])
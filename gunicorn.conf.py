@@ -0,0 +1,16 @@
+"""
+Gunicorn Configuration for Airline Data Analytics Dashboard
+Warms the preloaded app in the master process so forked workers start hot
+"""
+
+
+def when_ready(server):
+    """Load the first snapshot before any worker forks when the app is preloaded"""
+    if not server.cfg.preload_app:
+        return
+    from app import warm_up
+    try:
+        warm_up()
+    except Exception as e:
+        # Workers still fetch their first snapshot on demand
+        server.log.error(f"Startup warm-up failed: {str(e)}")
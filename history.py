@@ -0,0 +1,219 @@
+"""
+Flight History Store for Airline Data Analytics Dashboard
+On-disk flight history partitioned by flight_date, one SQLite file per day
+"""
+
+import glob
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_PREFIX = 'flights-'
+_PARTITION_SUFFIX = '.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flights (
+    flight_iata TEXT PRIMARY KEY,
+    dep_iata TEXT,
+    arr_iata TEXT,
+    airline_iata TEXT,
+    flight_status TEXT,
+    dep_scheduled TEXT,
+    fetched_at REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_route ON flights (dep_iata, arr_iata);
+"""
+
+# A later fetch of the same flight on the same day replaces the earlier one
+_UPSERT = """
+INSERT INTO flights (flight_iata, dep_iata, arr_iata, airline_iata, flight_status,
+                     dep_scheduled, fetched_at, record)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (flight_iata) DO UPDATE SET
+    dep_iata = excluded.dep_iata,
+    arr_iata = excluded.arr_iata,
+    airline_iata = excluded.airline_iata,
+    flight_status = excluded.flight_status,
+    dep_scheduled = excluded.dep_scheduled,
+    fetched_at = excluded.fetched_at,
+    record = excluded.record
+WHERE excluded.fetched_at >= flights.fetched_at
+"""
+
+
+def parse_date_range(start, end, default_days, max_days):
+    """
+    Parse an inclusive ISO date range from query arguments
+
+    Raises ValueError if a date is malformed, the range is reversed or it spans
+    more than max_days days. A missing end defaults to today and a missing start
+    to default_days days before the end.
+    """
+    try:
+        end_date = date.fromisoformat(end) if end else date.today()
+        start_date = date.fromisoformat(start) if start else end_date - timedelta(days=default_days - 1)
+    except ValueError:
+        raise ValueError("'start' and 'end' must be dates in YYYY-MM-DD format")
+    if start_date > end_date:
+        raise ValueError("'start' must not be after 'end'")
+    if (end_date - start_date).days >= max_days:
+        raise ValueError(f"date range must not exceed {max_days} days")
+    return start_date, end_date
+
+
+class FlightHistory:
+    """Every fetched flight, deduplicated on flight.iata + flight_date and kept for a retention window"""
+
+    def __init__(self, directory, retention_days=None, compact_interval=None):
+        """
+        Args:
+            directory: Directory holding one SQLite partition file per flight_date
+            retention_days: Partitions older than this many days are dropped on compaction
+            compact_interval: Minimum seconds between automatic compactions after an append
+        """
+        self.directory = directory
+        self.retention_days = retention_days or Config.HISTORY_RETENTION_DAYS
+        self.compact_interval = compact_interval or Config.HISTORY_COMPACT_INTERVAL
+        self._compacted_at = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _partition_path(self, day):
+        return os.path.join(self.directory, f'{_PARTITION_PREFIX}{day.isoformat()}{_PARTITION_SUFFIX}')
+
+    def _connect(self, path):
+        connection = sqlite3.connect(path, timeout=Config.HISTORY_BUSY_TIMEOUT)
+        # WAL lets other workers read a partition while one appends to it
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def partitions(self, start=None, end=None):
+        """(flight_date, path) of every stored partition within [start, end], oldest first"""
+        found = []
+        for name in os.listdir(self.directory):
+            if not (name.startswith(_PARTITION_PREFIX) and name.endswith(_PARTITION_SUFFIX)):
+                continue
+            try:
+                day = date.fromisoformat(name[len(_PARTITION_PREFIX):-len(_PARTITION_SUFFIX)])
+            except ValueError:
+                continue
+            if (start is None or day >= start) and (end is None or day <= end):
+                found.append((day, os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def append(self, flights, fetched_at=None):
+        """
+        Upsert flights into their flight_date partitions
+
+        Flights without a flight.iata or a valid flight_date cannot be
+        deduplicated and are skipped. Returns the number of rows written.
+        """
+        fetched_at = fetched_at or time.time()
+        by_day = {}
+        for flight in flights:
+            flight_iata = (flight.get('flight') or {}).get('iata')
+            try:
+                day = date.fromisoformat(flight.get('flight_date') or '')
+            except (TypeError, ValueError):
+                continue
+            if not flight_iata:
+                continue
+            departure = flight.get('departure') or {}
+            arrival = flight.get('arrival') or {}
+            by_day.setdefault(day, []).append((
+                flight_iata,
+                departure.get('iata'),
+                arrival.get('iata'),
+                (flight.get('airline') or {}).get('iata'),
+                flight.get('flight_status'),
+                departure.get('scheduled'),
+                fetched_at,
+                json.dumps(flight, separators=(',', ':'))
+            ))
+
+        written = 0
+        with self._lock:
+            for day, rows in by_day.items():
+                connection = self._connect(self._partition_path(day))
+                try:
+                    with connection:
+                        connection.executemany(_UPSERT, rows)
+                    written += len(rows)
+                finally:
+                    connection.close()
+
+        if time.time() - self._compacted_at >= self.compact_interval:
+            self.compact()
+        return written
+
+    def query(self, start, end, route_from=None, route_to=None):
+        """
+        Stored flights departing on dates in [start, end] as an Aviationstack-style payload
+
+        Only the partitions inside the range are opened.
+        """
+        conditions, params = [], []
+        if route_from:
+            conditions.append('dep_iata = ?')
+            params.append(route_from.upper())
+        if route_to:
+            conditions.append('arr_iata = ?')
+            params.append(route_to.upper())
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        flights = []
+        for _, path in self.partitions(start, end):
+            connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, timeout=Config.HISTORY_BUSY_TIMEOUT)
+            try:
+                rows = connection.execute(f'SELECT record FROM flights{where} ORDER BY dep_scheduled', params)
+                flights.extend(json.loads(record) for (record,) in rows)
+            except sqlite3.Error as e:
+                logger.warning(f"Skipping unreadable history partition {path}: {str(e)}")
+            finally:
+                connection.close()
+
+        return {
+            'pagination': {
+                'limit': len(flights),
+                'offset': 0,
+                'count': len(flights),
+                'total': len(flights)
+            },
+            'data': flights
+        }
+
+    def compact(self, today=None):
+        """Drop partitions past the retention window and reclaim space left by updates"""
+        today = today or date.today()
+        cutoff = today - timedelta(days=self.retention_days)
+        with self._lock:
+            self._compacted_at = time.time()
+            for day, path in self.partitions():
+                if day < cutoff:
+                    # The partition's WAL and shared-memory files go with it
+                    for stale_path in glob.glob(glob.escape(path) + '*'):
+                        try:
+                            os.remove(stale_path)
+                        except OSError as e:
+                            logger.warning(f"Could not remove {stale_path}: {str(e)}")
+                    continue
+                connection = self._connect(path)
+                try:
+                    (free_pages,) = connection.execute('PRAGMA freelist_count').fetchone()
+                    if free_pages:
+                        connection.execute('VACUUM')
+                    connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not compact history partition {path}: {str(e)}")
+                finally:
+                    connection.close()
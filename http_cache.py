@@ -0,0 +1,97 @@
+"""
+HTTP caching helpers for Airline Data Analytics Dashboard
+Strong ETags from dataset versions, conditional GET and response compression
+"""
+
+import gzip
+
+from cache import TTLCache, fingerprint
+from config import Config
+from metrics import registry
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+# Compressed bodies keyed by (etag, encoding); an ETag pins the exact content
+_compressed_cache = TTLCache(ttl=None, maxsize=Config.COMPRESSED_CACHE_ENTRIES)
+registry.register_cache('compressed', _compressed_cache)
+
+_COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html')
+
+
+def make_etag(request, version):
+    """Strong ETag for this endpoint and query string over one dataset version"""
+    return fingerprint([request.path, version, sorted(request.args.items(multi=True))])
+
+
+def _held_etag(request, etag):
+    """The variant of etag the client already holds, in any content encoding"""
+    for candidate in (etag, f'{etag}-gzip', f'{etag}-br'):
+        if request.if_none_match.contains(candidate):
+            return candidate
+    return None
+
+
+def is_not_modified(request, etag):
+    """True if the client already holds this ETag, in any content encoding"""
+    return _held_etag(request, etag) is not None
+
+
+def not_modified_response(response_class, request, etag):
+    """Empty 304 response carrying the ETag of the representation the client holds"""
+    response = response_class(status=304)
+    response.set_etag(_held_etag(request, etag) or etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def tag_response(response, etag):
+    """Attach the ETag, if any, and ask clients to revalidate before reusing the body"""
+    if etag is None:
+        return response
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _select_encoding(request):
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=Config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.GZIP_LEVEL)
+
+
+def compress_response(request, response):
+    """Compress a large buffered response body with brotli or gzip when accepted"""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in _COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _select_encoding(request)
+    body = response.get_data()
+    if encoding is None or len(body) < Config.COMPRESSION_MIN_SIZE:
+        return response
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        compressed = _compressed_cache.get_or_set((etag, encoding), lambda: _compress(body, encoding))
+        # Each encoding is a different representation, so it gets its own strong ETag
+        response.set_etag(f'{etag}-{encoding}')
+    else:
+        compressed = _compress(body, encoding)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    return response
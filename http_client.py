@@ -0,0 +1,144 @@
+"""
+Upstream HTTP client for Airline Data Analytics Dashboard
+Pooled keep-alive session with timeouts and jittered retry backoff
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+from metrics import registry, timed
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Transient upstream statuses worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def create_session(pool_size=None, retries=None, backoff=None, jitter=None):
+    """Build a requests.Session with a sized connection pool and bounded retries"""
+    pool_size = pool_size or Config.UPSTREAM_POOL_SIZE
+    retry = Retry(
+        total=Config.UPSTREAM_RETRIES if retries is None else retries,
+        backoff_factor=Config.UPSTREAM_BACKOFF if backoff is None else backoff,
+        backoff_jitter=Config.UPSTREAM_BACKOFF_JITTER if jitter is None else jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+def _error_kind(error):
+    """Low-cardinality label for a failed upstream request"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return f'http_{error.response.status_code}'
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return 'connection'
+    return 'invalid_response' if isinstance(error, ValueError) else 'other'
+
+
+class UpstreamClient:
+    """Thin JSON client for the Aviationstack API over a pooled session"""
+
+    def __init__(self, base_url=None, session=None, timeout=None):
+        self.base_url = (base_url or Config.AVIATIONSTACK_BASE_URL).rstrip('/')
+        self.session = session or create_session()
+        self.timeout = timeout or (Config.UPSTREAM_CONNECT_TIMEOUT, Config.UPSTREAM_READ_TIMEOUT)
+
+    def get_json(self, path, params=None):
+        """
+        GET base_url/path and decode the JSON body
+
+        Raises requests.exceptions.RequestException on connection errors,
+        timeouts, non-2xx responses after retries, or an undecodable body.
+        """
+        with timed('upstream'):
+            try:
+                response = self.session.get(f"{self.base_url}/{path.lstrip('/')}", params=params,
+                                            timeout=self.timeout)
+                response.raise_for_status()
+                return response.json()
+            except requests.exceptions.RequestException as e:
+                registry.increment('upstream_errors_total', kind=_error_kind(e))
+                raise
+
+    def get_all_pages(self, path, params=None, page_size=None, max_records=None, workers=None):
+        """
+        Fetch every offset page of a paginated endpoint and merge them
+
+        The first page is read to learn pagination.total; the remaining
+        offsets are then fetched concurrently by at most `workers` threads.
+        Any failed page raises, so callers never see a partial snapshot.
+
+        Args:
+            path: Endpoint path relative to base_url
+            params: Query parameters shared by every page
+            page_size: Rows per page (the upstream page limit)
+            max_records: Optional cap on the total number of rows fetched
+            workers: Maximum number of concurrent page requests
+        """
+        params = dict(params or {})
+        page_size = page_size or Config.MAX_FLIGHT_LIMIT
+        workers = workers or Config.BULK_FETCH_WORKERS
+
+        first = self.get_json(path, {**params, 'limit': page_size, 'offset': 0})
+        total = int((first.get('pagination') or {}).get('total') or 0)
+        target = min(total, max_records) if max_records else total
+        offsets = list(range(page_size, target, page_size))
+
+        pages = [first]
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(workers, len(offsets))) as executor:
+                pages.extend(executor.map(
+                    lambda offset: self.get_json(path, {**params, 'limit': page_size, 'offset': offset}),
+                    offsets
+                ))
+
+        data = [row for page in pages for row in (page.get('data') or [])][:target or None]
+        return {
+            'pagination': {
+                'limit': len(data),
+                'offset': 0,
+                'count': len(data),
+                'total': total
+            },
+            'data': data
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_shared_client = None
+_shared_client_pid = None
+_shared_client_lock = threading.Lock()
+
+
+def shared_upstream_client():
+    """
+    Process-wide UpstreamClient shared by every scraper
+
+    A forked worker gets its own client rather than reusing sockets
+    opened by the parent process.
+    """
+    global _shared_client, _shared_client_pid
+    with _shared_client_lock:
+        if _shared_client is None or _shared_client_pid != os.getpid():
+            _shared_client = UpstreamClient()
+            _shared_client_pid = os.getpid()
+        return _shared_client
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness for Airline Data Analytics Dashboard
+Drives the app under gunicorn against a local Aviationstack stand-in
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import requests
+
+from mock_generator import AIRPORTS, MockFlightGenerator
+
+DEFAULT_MIX = 'data=5,insights=3,charts=2'
+DEFAULT_RPS = 50
+DEFAULT_DURATION = 30  # seconds
+DEFAULT_CONCURRENCY = 64
+
+ENDPOINT_PATHS = {
+    'data': '/api/data',
+    'insights': '/api/insights',
+    'charts': '/api/charts'
+}
+
+# Share of dashboard requests that revalidate a previously received ETag
+REVALIDATE_RATE = 0.3
+
+
+class FakeAviationstack(ThreadingHTTPServer):
+    """Aviationstack /flights stand-in serving a fixed seeded dataset with injected latency and errors"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, flights=1000, latency=0.1, jitter=0.05, error_rate=0.0, max_page_size=100, seed=1):
+        """
+        Args:
+            port: Port to listen on, or 0 for any free port
+            flights: Size of the dataset behind the endpoint
+            latency: Mean seconds added to every response
+            jitter: Maximum seconds of random variation around latency
+            error_rate: Fraction of requests answered with 503
+            max_page_size: Largest limit honoured per page, like the real API plans
+            seed: Seed for the generated dataset
+        """
+        super().__init__(('127.0.0.1', port), _FakeHandler)
+        self.flights = MockFlightGenerator(seed).generate(flights)['data']
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_page_size = max_page_size
+        self.requests = 0
+        self.connections = 0
+        # Requests still to be answered with 503 before error_rate applies
+        self.fail_next = 0
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/v1'
+
+    def should_fail(self, params):
+        """Whether to answer a request for params with 503"""
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return True
+        return random.random() < self.error_rate
+
+    def page(self, params):
+        flights = self.flights
+        if params.get('dep_iata'):
+            flights = [flight for flight in flights if flight['departure']['iata'] == params['dep_iata']]
+        if params.get('arr_iata'):
+            flights = [flight for flight in flights if flight['arrival']['iata'] == params['arr_iata']]
+        limit = min(int(params.get('limit') or 100), self.max_page_size)
+        offset = int(params.get('offset') or 0)
+        rows = flights[offset:offset + limit]
+        return {
+            'pagination': {'limit': limit, 'offset': offset, 'count': len(rows), 'total': len(flights)},
+            'data': rows
+        }
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+
+    # Keep-alive like the real API, so clients can reuse pooled connections
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+
+        if url.path.rstrip('/') != '/v1/flights':
+            self._send(404, {'error': {'code': 'not_found'}})
+        elif server.should_fail(params):
+            self._send(503, {'error': {'code': 'service_unavailable'}})
+        else:
+            self._send(200, server.page(params))
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_app(upstream_url, workers, source, state_dir, preload=False):
+    """Start the dashboard under gunicorn pointed at the stand-in; returns (process, base_url)"""
+    port = free_port()
+    env = dict(
+        os.environ,
+        AVIATIONSTACK_BASE_URL=upstream_url,
+        SNAPSHOT_SOURCE=source,
+        SHARED_SNAPSHOT_DIR=os.path.join(state_dir, 'snapshot'),
+        SINGLE_FLIGHT_DIR=os.path.join(state_dir, 'singleflight'),
+        HISTORY_DIR=os.path.join(state_dir, 'history'),
+        METRICS_DIR=os.path.join(state_dir, 'metrics')
+    )
+    command = [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}',
+               '--workers', str(workers), '--threads', '4', '--timeout', '120', '--log-level', 'warning']
+    if preload:
+        command.append('--preload')
+    process = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+    return process, f'http://127.0.0.1:{port}'
+
+
+def wait_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f'{base_url}/api/insights', timeout=5).status_code == 200:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f'{base_url} did not become ready within {timeout}s')
+
+
+def parse_mix(value):
+    """Parse 'data=5,insights=3,charts=2' into endpoint weights"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINT_PATHS:
+            raise argparse.ArgumentTypeError(f'unknown endpoint {name!r}; choose from {", ".join(ENDPOINT_PATHS)}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadDriver:
+    """Open-loop driver issuing a weighted mix of dashboard requests at a fixed rate"""
+
+    def __init__(self, base_url, mix, rps, concurrency, seed=None):
+        self.base_url = base_url
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.rps = rps
+        self.random = random.Random(seed)
+        self.airports = list(AIRPORTS)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.samples = {name: [] for name in self.names}
+        self.errors = {name: 0 for name in self.names}
+        self.etags = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _request_for(self, name):
+        """Path, query and headers of one realistic dashboard request"""
+        params = {}
+        if name == 'data':
+            # Most dashboard loads are unfiltered; the rest pick a route filter
+            roll = self.random.random()
+            if roll < 0.3:
+                params['from'] = self.random.choice(self.airports)
+            if roll < 0.1:
+                params['to'] = self.random.choice(self.airports)
+            params['limit'] = self.random.choice([10, 25, 50, 100])
+        headers = {'Accept-Encoding': 'gzip, br'}
+        key = (name, tuple(sorted(params.items())))
+        if key in self.etags and self.random.random() < REVALIDATE_RATE:
+            headers['If-None-Match'] = self.etags[key]
+        return ENDPOINT_PATHS[name], params, headers, key
+
+    def _issue(self, name, scheduled):
+        path, params, headers, key = self._request_for(name)
+        try:
+            response = self._session().get(f'{self.base_url}{path}', params=params, headers=headers, timeout=30)
+            ok = response.status_code in (200, 304)
+            if response.headers.get('ETag'):
+                self.etags[key] = response.headers['ETag']
+        except requests.exceptions.RequestException:
+            ok = False
+        # Latency runs from the scheduled send time, so a stalled server is not hidden by queueing
+        latency = time.perf_counter() - scheduled
+        with self._lock:
+            self.samples[name].append(latency)
+            if not ok:
+                self.errors[name] += 1
+
+    def run(self, duration):
+        """Send requests for duration seconds and return the per-endpoint report"""
+        start = time.perf_counter()
+        interval = 1.0 / self.rps
+        sent = 0
+        while True:
+            scheduled = start + sent * interval
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name = self.random.choices(self.names, weights=self.weights)[0]
+            self.executor.submit(self._issue, name, scheduled)
+            sent += 1
+        self.executor.shutdown(wait=True)
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        report = {}
+        for name in self.names + ['all']:
+            samples = (sum(self.samples.values(), []) if name == 'all' else self.samples[name])
+            errors = sum(self.errors.values()) if name == 'all' else self.errors[name]
+            if not samples:
+                continue
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+            report[name] = {
+                'requests': len(samples),
+                'throughput_rps': round(len(samples) / elapsed, 2),
+                'error_rate': round(errors / len(samples), 4),
+                'p50_ms': round(float(p50), 2),
+                'p95_ms': round(float(p95), 2),
+                'p99_ms': round(float(p99), 2)
+            }
+        return report
+
+
+def print_report(report):
+    print(f"\n{'endpoint':<10} {'requests':>9} {'rps':>8} {'errors':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in report.items():
+        print(f"{name:<10} {row['requests']:>9} {row['throughput_rps']:>8.1f} {row['error_rate']:>7.1%} "
+              f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the dashboard against a local Aviationstack stand-in')
+    parser.add_argument('--url', help='test an already running server instead of starting gunicorn')
+    parser.add_argument('--rps', type=float, default=DEFAULT_RPS, help='target requests per second')
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help='seconds to send traffic')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help='endpoint weights (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='maximum requests in flight')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+    parser.add_argument('--preload', action='store_true', help='start gunicorn with --preload and a warm-up')
+    parser.add_argument('--source', default='aviationstack_bulk', help='SNAPSHOT_SOURCE for the app under test')
+    parser.add_argument('--upstream-flights', type=int, default=1000, help='flights served by the stand-in')
+    parser.add_argument('--upstream-latency', type=float, default=0.1, help='stand-in mean latency in seconds')
+    parser.add_argument('--upstream-jitter', type=float, default=0.05, help='stand-in latency jitter in seconds')
+    parser.add_argument('--upstream-error-rate', type=float, default=0.0, help='fraction of stand-in 503s')
+    parser.add_argument('--upstream-page-size', type=int, default=100, help='largest page the stand-in returns')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='also write the report as JSON to this path')
+    args = parser.parse_args()
+
+    upstream = process = None
+    base_url = args.url
+    try:
+        if base_url is None:
+            upstream = FakeAviationstack(flights=args.upstream_flights, latency=args.upstream_latency,
+                                         jitter=args.upstream_jitter, error_rate=args.upstream_error_rate,
+                                         max_page_size=args.upstream_page_size, seed=args.seed)
+            threading.Thread(target=upstream.serve_forever, daemon=True).start()
+            state_dir = tempfile.mkdtemp(prefix='airline-loadtest-')
+            process, base_url = start_app(upstream.base_url, args.workers, args.source, state_dir,
+                                          preload=args.preload)
+            print(f"Stand-in upstream at {upstream.base_url}; app at {base_url}", flush=True)
+        wait_ready(base_url)
+
+        print(f"Sending {args.rps:g} req/s for {args.duration:g}s...", flush=True)
+        report = LoadDriver(base_url, args.mix, args.rps, args.concurrency, seed=args.seed).run(args.duration)
+        print_report(report)
+        if upstream is not None:
+            print(f"\nUpstream requests: {upstream.requests}")
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'config': vars(args), 'report': report}, f, indent=2)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        if upstream is not None:
+            upstream.shutdown()
+
+
+if __name__ == '__main__':
+    main()
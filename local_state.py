@@ -0,0 +1,26 @@
+"""
+Local State Directories for Airline Data Analytics Dashboard
+Private directories through which the worker processes of one deployment share files
+"""
+
+import os
+import stat
+
+
+def ensure_private_dir(path):
+    """
+    Create path accessible only to this user, or check that an existing one is
+
+    Every worker trusts what it reads from these directories, so one created
+    first by another local user, or one others can write to, is refused with
+    PermissionError rather than used.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{path} is writable by other users")
+    return path
@@ -0,0 +1,290 @@
+"""
+Metrics for Airline Data Analytics Dashboard
+Per-stage latency histograms and counters, exposed as Server-Timing and Prometheus text
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from config import Config
+from local_state import ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'airline_dashboard_'
+
+# Upper bounds in seconds; the +Inf bucket is implied
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Name -> (Prometheus type, help text) of every metric this module records
+METRICS = {
+    'request_duration_seconds': ('histogram', 'Time to handle a request, by route and status'),
+    'stage_duration_seconds': ('histogram', 'Time spent in one hot-path stage, by stage'),
+    'upstream_errors_total': ('counter', 'Failed upstream requests after retries, by kind'),
+    'cache_hits_total': ('counter', 'Cache lookups answered from the cache, by cache'),
+    'cache_misses_total': ('counter', 'Cache lookups that had to compute the value, by cache')
+}
+
+# Stage timings of the request being handled, or None outside a request
+_request_timings = ContextVar('request_timings', default=None)
+
+
+class MetricsRegistry:
+    """
+    Histograms and counters of this process, merged with other workers' on collection
+
+    A background thread in each worker writes its state to a small JSON file in
+    the shared directory at most once per flush interval, and only after it
+    changed; collecting sums the files of every live worker, so a scrape sees
+    the whole server whichever worker answers it.
+    """
+
+    def __init__(self, directory=None, flush_interval=None):
+        self.directory = directory or None
+        self.flush_interval = flush_interval or Config.METRICS_FLUSH_INTERVAL
+        self._histograms = {}
+        self._counters = {}
+        self._caches = {}
+        self._dirty = False
+        self._pid = None
+        self._prefork = False
+        self._lock = threading.Lock()
+        if self.directory:
+            try:
+                ensure_private_dir(self.directory)
+            except OSError as e:
+                logger.warning(f"Metrics will not be merged across workers: {str(e)}")
+                self.directory = None
+
+    def _reset_after_fork(self):
+        # A forked worker starts from zero instead of re-reporting the parent's counts
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._histograms = {}
+            self._counters = {}
+            # Threads do not survive a fork, so each worker starts its own flusher
+            if self.directory is not None and not self._prefork:
+                threading.Thread(target=self._run_flusher, name='metrics-flusher', daemon=True).start()
+
+    def observe(self, name, seconds, **labels):
+        """Record one duration in the histogram name"""
+        key = (name, tuple(sorted(labels.items())))
+        position = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self._reset_after_fork()
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+            series[position] += 1
+            series[-1] += seconds
+            self._dirty = True
+
+    def increment(self, name, amount=1, **labels):
+        """Add amount to the counter name"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._reset_after_fork()
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._dirty = True
+
+    @contextmanager
+    def prefork(self):
+        """
+        Record without starting the flusher thread, for work done before workers fork
+
+        A master process must not hold threads or locks across a fork; what it
+        records here is discarded, and recording starts afresh afterwards.
+        """
+        with self._lock:
+            self._prefork = True
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._prefork = False
+                self._pid = None
+
+    def register_cache(self, name, cache):
+        """Report the hit and miss counts of a TTLCache under name"""
+        self._caches[name] = cache
+
+    def state(self):
+        """JSON-compatible copy of this process's metrics"""
+        with self._lock:
+            self._reset_after_fork()
+            histograms = [[name, list(labels), list(series)] for (name, labels), series in self._histograms.items()]
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+        for cache_name, cache in self._caches.items():
+            stats = cache.stats()
+            counters.append(['cache_hits_total', [['cache', cache_name]], stats['hits']])
+            counters.append(['cache_misses_total', [['cache', cache_name]], stats['misses']])
+        return {'histograms': histograms, 'counters': counters}
+
+    def _state_path(self, pid):
+        return os.path.join(self.directory, f'metrics-{pid}.json')
+
+    def flush(self):
+        """Write this process's metrics for other workers to merge"""
+        if self.directory is None:
+            return
+        self._dirty = False
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.state(), f, separators=(',', ':'))
+            os.replace(tmp_path, self._state_path(os.getpid()))
+        except OSError as e:
+            logger.error(f"Could not write metrics: {str(e)}")
+
+    def _run_flusher(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+    def _worker_states(self):
+        """This process's state plus the last flushed state of every other live worker"""
+        states = [self.state()]
+        if self.directory is None:
+            return states
+        # Keep this worker's file current so the next scrape, wherever it lands, agrees
+        self.flush()
+        for name in os.listdir(self.directory):
+            if not (name.startswith('metrics-') and name.endswith('.json')):
+                continue
+            try:
+                pid = int(name[len('metrics-'):-len('.json')])
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                # Counters of an exited worker drop out; Prometheus treats that as a reset
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            except PermissionError:
+                pass
+            try:
+                with open(path) as f:
+                    states.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return states
+
+    def collect(self):
+        """(histograms, counters) summed over all workers, keyed by (name, labels)"""
+        histograms, counters = {}, {}
+        for state in self._worker_states():
+            for name, labels, series in state['histograms']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                total = histograms.get(key)
+                histograms[key] = series if total is None else [a + b for a, b in zip(total, series)]
+            for name, labels, value in state['counters']:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                counters[key] = counters.get(key, 0) + value
+        return histograms, counters
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def render_prometheus(registry, gauges=None):
+    """
+    Prometheus text exposition of every recorded metric plus the given gauges
+
+    Args:
+        registry: MetricsRegistry to collect from
+        gauges: Optional list of (name, help, labels dict, value) read at scrape time
+    """
+    histograms, counters = registry.collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        if kind == 'histogram':
+            series = sorted((labels, values) for (metric, labels), values in histograms.items() if metric == name)
+        else:
+            series = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+        if not series:
+            continue
+        lines.append(f'# HELP {PREFIX}{name} {help_text}')
+        lines.append(f'# TYPE {PREFIX}{name} {kind}')
+        for labels, values in series:
+            if kind == 'counter':
+                lines.append(f'{PREFIX}{name}{_labels(labels)} {values}')
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), values):
+                cumulative += count
+                lines.append(f'{PREFIX}{name}_bucket{_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{PREFIX}{name}_sum{_labels(labels)} {values[-1]:.6f}')
+            lines.append(f'{PREFIX}{name}_count{_labels(labels)} {cumulative}')
+
+    gauges = list(gauges or [])
+    for (metric, labels), hits in sorted(counters.items()):
+        if metric == 'cache_hits_total':
+            lookups = hits + counters.get(('cache_misses_total', labels), 0)
+            gauges.append(('cache_hit_ratio', 'Share of cache lookups answered from the cache', dict(labels),
+                           round(hits / lookups, 4) if lookups else 0.0))
+
+    described = set()
+    for name, help_text, labels, value in gauges:
+        if name not in described:
+            described.add(name)
+            lines.append(f'# HELP {PREFIX}{name} {help_text}')
+            lines.append(f'# TYPE {PREFIX}{name} gauge')
+        lines.append(f'{PREFIX}{name}{_labels(sorted(labels.items()))} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def start_request():
+    """Begin collecting stage timings for the current request"""
+    _request_timings.set([])
+
+
+def request_timings():
+    """(stage, seconds) pairs recorded so far in the current request"""
+    return _request_timings.get() or []
+
+
+def server_timing(timings):
+    """Server-Timing header value for (stage, seconds) pairs, durations in milliseconds"""
+    return ', '.join(f'{stage};dur={seconds * 1000:.2f}' for stage, seconds in timings)
+
+
+@contextmanager
+def timed(stage):
+    """Time the enclosed block into the stage histogram and the current request's Server-Timing"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe('stage_duration_seconds', elapsed, stage=stage)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+# Process-wide registry every instrumented module records into
+registry = MetricsRegistry(Config.METRICS_DIR)
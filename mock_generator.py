@@ -0,0 +1,584 @@
+"""
+Mock Flight Generator for Airline Data Analytics Dashboard
+Vectorized, seedable generator of Aviationstack-shaped synthetic flights
+"""
+
+import gc
+from datetime import datetime
+
+import numpy as np
+
+# Comprehensive worldwide data for realistic simulation
+AIRPORTS = {
+    # North America
+    'JFK': 'John F Kennedy International Airport',
+    'LAX': 'Los Angeles International Airport',
+    'ORD': 'Chicago O\'Hare International Airport',
+    'ATL': 'Hartsfield-Jackson Atlanta International Airport',
+    'DFW': 'Dallas/Fort Worth International Airport',
+    'DEN': 'Denver International Airport',
+    'SFO': 'San Francisco International Airport',
+    'LAS': 'McCarran International Airport',
+    'SEA': 'Seattle-Tacoma International Airport',
+    'MIA': 'Miami International Airport',
+    'YYZ': 'Toronto Pearson International Airport',
+    'YVR': 'Vancouver International Airport',
+    'MEX': 'Mexico City International Airport',
+
+    # Europe
+    'LHR': 'London Heathrow Airport',
+    'CDG': 'Charles de Gaulle Airport',
+    'FRA': 'Frankfurt Airport',
+    'AMS': 'Amsterdam Airport Schiphol',
+    'MAD': 'Madrid-Barajas Airport',
+    'FCO': 'Leonardo da Vinci International Airport',
+    'MUC': 'Munich Airport',
+    'ZUR': 'Zurich Airport',
+    'VIE': 'Vienna International Airport',
+    'ARN': 'Stockholm Arlanda Airport',
+    'CPH': 'Copenhagen Airport',
+    'HEL': 'Helsinki Airport',
+    'IST': 'Istanbul Airport',
+    'SVO': 'Sheremetyevo International Airport',
+
+    # Asia-Pacific
+    'NRT': 'Narita International Airport',
+    'HND': 'Haneda Airport',
+    'ICN': 'Incheon International Airport',
+    'PEK': 'Beijing Capital International Airport',
+    'PVG': 'Shanghai Pudong International Airport',
+    'HKG': 'Hong Kong International Airport',
+    'SIN': 'Singapore Changi Airport',
+    'BKK': 'Suvarnabhumi Airport',
+    'KUL': 'Kuala Lumpur International Airport',
+    'CGK': 'Soekarno-Hatta International Airport',
+    'SYD': 'Sydney Kingsford Smith Airport',
+    'MEL': 'Melbourne Airport',
+    'BNE': 'Brisbane Airport',
+    'AKL': 'Auckland Airport',
+    'DEL': 'Indira Gandhi International Airport',
+    'BOM': 'Chhatrapati Shivaji International Airport',
+    'BLR': 'Kempegowda International Airport',
+    'MAA': 'Chennai International Airport',
+    'HYD': 'Rajiv Gandhi International Airport',
+
+    # Middle East & Africa
+    'DXB': 'Dubai International Airport',
+    'DOH': 'Hamad International Airport',
+    'AUH': 'Abu Dhabi International Airport',
+    'KWI': 'Kuwait International Airport',
+    'CAI': 'Cairo International Airport',
+    'JNB': 'O.R. Tambo International Airport',
+    'CPT': 'Cape Town International Airport',
+    'NBO': 'Jomo Kenyatta International Airport',
+    'ADD': 'Addis Ababa Bole International Airport',
+
+    # South America
+    'GRU': 'São Paulo-Guarulhos International Airport',
+    'GIG': 'Rio de Janeiro-Galeão International Airport',
+    'EZE': 'Ezeiza International Airport',
+    'SCL': 'Santiago International Airport',
+    'LIM': 'Jorge Chávez International Airport',
+    'BOG': 'El Dorado International Airport'
+}
+
+AIRLINES = [
+    # North American Airlines
+    {'name': 'American Airlines', 'iata': 'AA', 'icao': 'AAL'},
+    {'name': 'United Airlines', 'iata': 'UA', 'icao': 'UAL'},
+    {'name': 'Delta Air Lines', 'iata': 'DL', 'icao': 'DAL'},
+    {'name': 'Southwest Airlines', 'iata': 'WN', 'icao': 'SWA'},
+    {'name': 'JetBlue Airways', 'iata': 'B6', 'icao': 'JBU'},
+    {'name': 'Air Canada', 'iata': 'AC', 'icao': 'ACA'},
+    {'name': 'Alaska Airlines', 'iata': 'AS', 'icao': 'ASA'},
+
+    # European Airlines
+    {'name': 'British Airways', 'iata': 'BA', 'icao': 'BAW'},
+    {'name': 'Lufthansa', 'iata': 'LH', 'icao': 'DLH'},
+    {'name': 'Air France', 'iata': 'AF', 'icao': 'AFR'},
+    {'name': 'KLM', 'iata': 'KL', 'icao': 'KLM'},
+    {'name': 'Turkish Airlines', 'iata': 'TK', 'icao': 'THY'},
+    {'name': 'Swiss International Air Lines', 'iata': 'LX', 'icao': 'SWR'},
+    {'name': 'Austrian Airlines', 'iata': 'OS', 'icao': 'AUA'},
+    {'name': 'Finnair', 'iata': 'AY', 'icao': 'FIN'},
+    {'name': 'SAS', 'iata': 'SK', 'icao': 'SAS'},
+    {'name': 'Ryanair', 'iata': 'FR', 'icao': 'RYR'},
+    {'name': 'easyJet', 'iata': 'U2', 'icao': 'EZY'},
+
+    # Asian Airlines
+    {'name': 'Singapore Airlines', 'iata': 'SQ', 'icao': 'SIA'},
+    {'name': 'Cathay Pacific', 'iata': 'CX', 'icao': 'CPA'},
+    {'name': 'Japan Airlines', 'iata': 'JL', 'icao': 'JAL'},
+    {'name': 'All Nippon Airways', 'iata': 'NH', 'icao': 'ANA'},
+    {'name': 'Korean Air', 'iata': 'KE', 'icao': 'KAL'},
+    {'name': 'China Southern Airlines', 'iata': 'CZ', 'icao': 'CSN'},
+    {'name': 'China Eastern Airlines', 'iata': 'MU', 'icao': 'CES'},
+    {'name': 'Air China', 'iata': 'CA', 'icao': 'CCA'},
+    {'name': 'Thai Airways', 'iata': 'TG', 'icao': 'THA'},
+    {'name': 'Malaysia Airlines', 'iata': 'MH', 'icao': 'MAS'},
+    {'name': 'Qantas', 'iata': 'QF', 'icao': 'QFA'},
+    {'name': 'Jetstar', 'iata': 'JQ', 'icao': 'JST'},
+    {'name': 'IndiGo', 'iata': '6E', 'icao': 'IGO'},
+    {'name': 'Air India', 'iata': 'AI', 'icao': 'AIC'},
+    {'name': 'SpiceJet', 'iata': 'SG', 'icao': 'SEJ'},
+
+    # Middle Eastern Airlines
+    {'name': 'Emirates', 'iata': 'EK', 'icao': 'UAE'},
+    {'name': 'Qatar Airways', 'iata': 'QR', 'icao': 'QTR'},
+    {'name': 'Etihad Airways', 'iata': 'EY', 'icao': 'ETD'},
+    {'name': 'Kuwait Airways', 'iata': 'KU', 'icao': 'KAC'},
+
+    # African Airlines
+    {'name': 'South African Airways', 'iata': 'SA', 'icao': 'SAA'},
+    {'name': 'Ethiopian Airlines', 'iata': 'ET', 'icao': 'ETH'},
+    {'name': 'Kenya Airways', 'iata': 'KQ', 'icao': 'KQA'},
+    {'name': 'EgyptAir', 'iata': 'MS', 'icao': 'MSR'},
+
+    # South American Airlines
+    {'name': 'LATAM Airlines', 'iata': 'LA', 'icao': 'LAN'},
+    {'name': 'Avianca', 'iata': 'AV', 'icao': 'AVA'},
+    {'name': 'Azul Brazilian Airlines', 'iata': 'AD', 'icao': 'AZU'},
+    {'name': 'Copa Airlines', 'iata': 'CM', 'icao': 'CMP'}
+]
+
+# Popular worldwide routes with realistic frequency weights
+POPULAR_ROUTES = [
+    # North America Domestic
+    ('JFK', 'LAX', 15), ('LAX', 'JFK', 15),
+    ('ORD', 'DFW', 12), ('DFW', 'ORD', 12),
+    ('ATL', 'MIA', 10), ('MIA', 'ATL', 10),
+    ('SFO', 'SEA', 8), ('SEA', 'SFO', 8),
+    ('JFK', 'SFO', 9), ('SFO', 'JFK', 9),
+    ('ORD', 'LAX', 11), ('LAX', 'ORD', 11),
+    ('ATL', 'JFK', 13), ('JFK', 'ATL', 13),
+    ('DFW', 'LAX', 8), ('LAX', 'DFW', 8),
+    ('MIA', 'JFK', 7), ('JFK', 'MIA', 7),
+
+    # Trans-Atlantic Routes
+    ('JFK', 'LHR', 12), ('LHR', 'JFK', 12),
+    ('LAX', 'LHR', 8), ('LHR', 'LAX', 8),
+    ('ORD', 'CDG', 7), ('CDG', 'ORD', 7),
+    ('JFK', 'CDG', 10), ('CDG', 'JFK', 10),
+    ('ATL', 'LHR', 6), ('LHR', 'ATL', 6),
+    ('JFK', 'FRA', 8), ('FRA', 'JFK', 8),
+    ('DFW', 'LHR', 5), ('LHR', 'DFW', 5),
+    ('MIA', 'MAD', 4), ('MAD', 'MIA', 4),
+    ('JFK', 'AMS', 6), ('AMS', 'JFK', 6),
+
+    # Trans-Pacific Routes
+    ('LAX', 'NRT', 10), ('NRT', 'LAX', 10),
+    ('SFO', 'HKG', 8), ('HKG', 'SFO', 8),
+    ('SEA', 'ICN', 7), ('ICN', 'SEA', 7),
+    ('LAX', 'SYD', 6), ('SYD', 'LAX', 6),
+    ('SFO', 'SIN', 5), ('SIN', 'SFO', 5),
+    ('LAX', 'PEK', 7), ('PEK', 'LAX', 7),
+    ('ORD', 'NRT', 5), ('NRT', 'ORD', 5),
+    ('DFW', 'ICN', 4), ('ICN', 'DFW', 4),
+
+    # European Routes
+    ('LHR', 'CDG', 15), ('CDG', 'LHR', 15),
+    ('LHR', 'FRA', 12), ('FRA', 'LHR', 12),
+    ('CDG', 'AMS', 10), ('AMS', 'CDG', 10),
+    ('LHR', 'AMS', 11), ('AMS', 'LHR', 11),
+    ('FRA', 'MUC', 8), ('MUC', 'FRA', 8),
+    ('LHR', 'MAD', 7), ('MAD', 'LHR', 7),
+    ('CDG', 'FCO', 6), ('FCO', 'CDG', 6),
+    ('AMS', 'ZUR', 5), ('ZUR', 'AMS', 5),
+    ('LHR', 'IST', 6), ('IST', 'LHR', 6),
+
+    # Asian Routes
+    ('HKG', 'SIN', 12), ('SIN', 'HKG', 12),
+    ('NRT', 'ICN', 10), ('ICN', 'NRT', 10),
+    ('BKK', 'SIN', 8), ('SIN', 'BKK', 8),
+    ('HKG', 'BKK', 7), ('BKK', 'HKG', 7),
+    ('PEK', 'PVG', 9), ('PVG', 'PEK', 9),
+    ('DEL', 'BOM', 8), ('BOM', 'DEL', 8),
+    ('SIN', 'KUL', 6), ('KUL', 'SIN', 6),
+    ('HKG', 'SYD', 5), ('SYD', 'HKG', 5),
+    ('NRT', 'SIN', 4), ('SIN', 'NRT', 4),
+
+    # Middle East Hub Routes
+    ('DXB', 'LHR', 10), ('LHR', 'DXB', 10),
+    ('DOH', 'LHR', 8), ('LHR', 'DOH', 8),
+    ('DXB', 'JFK', 7), ('JFK', 'DXB', 7),
+    ('DXB', 'BOM', 6), ('BOM', 'DXB', 6),
+    ('DOH', 'SIN', 5), ('SIN', 'DOH', 5),
+    ('DXB', 'SIN', 6), ('SIN', 'DXB', 6),
+    ('AUH', 'LHR', 4), ('LHR', 'AUH', 4),
+
+    # Africa Routes
+    ('JNB', 'CPT', 8), ('CPT', 'JNB', 8),
+    ('CAI', 'LHR', 5), ('LHR', 'CAI', 5),
+    ('ADD', 'DXB', 4), ('DXB', 'ADD', 4),
+    ('JNB', 'LHR', 6), ('LHR', 'JNB', 6),
+    ('NBO', 'DXB', 3), ('DXB', 'NBO', 3),
+
+    # South America Routes
+    ('GRU', 'GIG', 6), ('GIG', 'GRU', 6),
+    ('GRU', 'EZE', 5), ('EZE', 'GRU', 5),
+    ('SCL', 'LIM', 4), ('LIM', 'SCL', 4),
+    ('BOG', 'MIA', 5), ('MIA', 'BOG', 5),
+    ('GRU', 'LHR', 4), ('LHR', 'GRU', 4),
+    ('GIG', 'CDG', 3), ('CDG', 'GIG', 3)
+]
+
+FLIGHT_STATUSES = [
+    ('scheduled', 60), ('active', 20), ('landed', 15), 
+    ('delayed', 3), ('cancelled', 1), ('diverted', 1)
+]
+
+# Realistic global distribution of airline market presence
+AIRLINE_WEIGHTS = [
+    12, 10, 8, 6, 4, 3, 2,  # North American airlines (7)
+    8, 6, 5, 4, 3, 2, 2, 2, 2, 2, 2,  # European airlines (11)
+    7, 6, 5, 4, 4, 3, 3, 3, 2, 2, 2, 2, 2, 2, 2,  # Asian airlines (15)
+    5, 4, 3, 2,  # Middle Eastern airlines (4)
+    2, 2, 2, 2,  # African airlines (4)
+    3, 2, 2, 2   # South American airlines (4)
+]
+
+# Departure hours (05:00-22:00) weighted towards the morning peak
+DEPARTURE_HOURS = list(range(5, 23))
+DEPARTURE_HOUR_WEIGHTS = [2, 4, 8, 12, 15, 18, 20, 18, 15, 12, 10, 8, 6, 4, 3, 2, 1, 1]
+
+AIRCRAFT_TYPES = [
+    'B737', 'A320', 'B777', 'A330', 'E190', 'B757', 'A319', 
+    'B767', 'A321', 'E175', 'B787', 'A350', 'B747', 'A380'
+]
+
+TERMINALS = ['1', '2', '3', '4', '5', 'A', 'B', 'C', 'D', 'E', 'F', 'G']
+GATE_LETTERS = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+REGISTRATION_SUFFIXES = ['AA', 'UA', 'DL', 'WN', 'B6']
+
+DEFAULT_FLIGHT_DURATION = 180
+
+# Realistic flight duration per route (in minutes)
+FLIGHT_DURATIONS = {
+    # North America Domestic
+    ('JFK', 'LAX'): 360, ('LAX', 'JFK'): 330,
+    ('ORD', 'DFW'): 150, ('DFW', 'ORD'): 140,
+    ('ATL', 'MIA'): 120, ('MIA', 'ATL'): 110,
+    ('SFO', 'SEA'): 120, ('SEA', 'SFO'): 110,
+    ('JFK', 'SFO'): 370, ('SFO', 'JFK'): 320,
+    ('ORD', 'LAX'): 270, ('LAX', 'ORD'): 240,
+    ('ATL', 'JFK'): 140, ('JFK', 'ATL'): 130,
+    ('DFW', 'LAX'): 180, ('LAX', 'DFW'): 170,
+    ('MIA', 'JFK'): 165, ('JFK', 'MIA'): 160,
+
+    # Trans-Atlantic Routes
+    ('JFK', 'LHR'): 430, ('LHR', 'JFK'): 480,
+    ('LAX', 'LHR'): 660, ('LHR', 'LAX'): 720,
+    ('ORD', 'CDG'): 480, ('CDG', 'ORD'): 540,
+    ('JFK', 'CDG'): 440, ('CDG', 'JFK'): 490,
+    ('ATL', 'LHR'): 480, ('LHR', 'ATL'): 540,
+    ('JFK', 'FRA'): 460, ('FRA', 'JFK'): 510,
+    ('DFW', 'LHR'): 560, ('LHR', 'DFW'): 620,
+    ('MIA', 'MAD'): 500, ('MAD', 'MIA'): 560,
+    ('JFK', 'AMS'): 440, ('AMS', 'JFK'): 490,
+
+    # Trans-Pacific Routes
+    ('LAX', 'NRT'): 660, ('NRT', 'LAX'): 630,
+    ('SFO', 'HKG'): 900, ('HKG', 'SFO'): 840,
+    ('SEA', 'ICN'): 660, ('ICN', 'SEA'): 630,
+    ('LAX', 'SYD'): 900, ('SYD', 'LAX'): 840,
+    ('SFO', 'SIN'): 1020, ('SIN', 'SFO'): 960,
+    ('LAX', 'PEK'): 780, ('PEK', 'LAX'): 720,
+    ('ORD', 'NRT'): 780, ('NRT', 'ORD'): 720,
+    ('DFW', 'ICN'): 840, ('ICN', 'DFW'): 780,
+
+    # European Routes
+    ('LHR', 'CDG'): 80, ('CDG', 'LHR'): 80,
+    ('LHR', 'FRA'): 90, ('FRA', 'LHR'): 90,
+    ('CDG', 'AMS'): 75, ('AMS', 'CDG'): 75,
+    ('LHR', 'AMS'): 65, ('AMS', 'LHR'): 65,
+    ('FRA', 'MUC'): 60, ('MUC', 'FRA'): 60,
+    ('LHR', 'MAD'): 140, ('MAD', 'LHR'): 140,
+    ('CDG', 'FCO'): 130, ('FCO', 'CDG'): 130,
+    ('AMS', 'ZUR'): 90, ('ZUR', 'AMS'): 90,
+    ('LHR', 'IST'): 240, ('IST', 'LHR'): 240,
+
+    # Asian Routes
+    ('HKG', 'SIN'): 200, ('SIN', 'HKG'): 200,
+    ('NRT', 'ICN'): 140, ('ICN', 'NRT'): 140,
+    ('BKK', 'SIN'): 140, ('SIN', 'BKK'): 140,
+    ('HKG', 'BKK'): 160, ('BKK', 'HKG'): 160,
+    ('PEK', 'PVG'): 120, ('PVG', 'PEK'): 120,
+    ('DEL', 'BOM'): 120, ('BOM', 'DEL'): 120,
+    ('SIN', 'KUL'): 90, ('KUL', 'SIN'): 90,
+    ('HKG', 'SYD'): 540, ('SYD', 'HKG'): 540,
+    ('NRT', 'SIN'): 420, ('SIN', 'NRT'): 420,
+
+    # Middle East Hub Routes
+    ('DXB', 'LHR'): 420, ('LHR', 'DXB'): 420,
+    ('DOH', 'LHR'): 400, ('LHR', 'DOH'): 400,
+    ('DXB', 'JFK'): 840, ('JFK', 'DXB'): 840,
+    ('DXB', 'BOM'): 180, ('BOM', 'DXB'): 180,
+    ('DOH', 'SIN'): 420, ('SIN', 'DOH'): 420,
+    ('DXB', 'SIN'): 420, ('SIN', 'DXB'): 420,
+    ('AUH', 'LHR'): 420, ('LHR', 'AUH'): 420,
+
+    # Africa Routes
+    ('JNB', 'CPT'): 120, ('CPT', 'JNB'): 120,
+    ('CAI', 'LHR'): 300, ('LHR', 'CAI'): 300,
+    ('ADD', 'DXB'): 240, ('DXB', 'ADD'): 240,
+    ('JNB', 'LHR'): 660, ('LHR', 'JNB'): 660,
+    ('NBO', 'DXB'): 300, ('DXB', 'NBO'): 300,
+
+    # South America Routes
+    ('GRU', 'GIG'): 60, ('GIG', 'GRU'): 60,
+    ('GRU', 'EZE'): 140, ('EZE', 'GRU'): 140,
+    ('SCL', 'LIM'): 120, ('LIM', 'SCL'): 120,
+    ('BOG', 'MIA'): 180, ('MIA', 'BOG'): 180,
+    ('GRU', 'LHR'): 660, ('LHR', 'GRU'): 660,
+    ('GIG', 'CDG'): 660, ('CDG', 'GIG'): 660,
+}
+
+# Timezones based on airport location
+AIRPORT_TIMEZONES = {
+    # North America
+    'JFK': 'America/New_York', 'LAX': 'America/Los_Angeles', 'ORD': 'America/Chicago',
+    'ATL': 'America/New_York', 'DFW': 'America/Chicago', 'DEN': 'America/Denver',
+    'SFO': 'America/Los_Angeles', 'LAS': 'America/Los_Angeles', 'SEA': 'America/Los_Angeles',
+    'MIA': 'America/New_York', 'YYZ': 'America/Toronto', 'YVR': 'America/Vancouver',
+    'MEX': 'America/Mexico_City',
+
+    # Europe
+    'LHR': 'Europe/London', 'CDG': 'Europe/Paris', 'FRA': 'Europe/Berlin',
+    'AMS': 'Europe/Amsterdam', 'MAD': 'Europe/Madrid', 'FCO': 'Europe/Rome',
+    'MUC': 'Europe/Berlin', 'ZUR': 'Europe/Zurich', 'VIE': 'Europe/Vienna',
+    'ARN': 'Europe/Stockholm', 'CPH': 'Europe/Copenhagen', 'HEL': 'Europe/Helsinki',
+    'IST': 'Europe/Istanbul', 'SVO': 'Europe/Moscow',
+
+    # Asia-Pacific
+    'NRT': 'Asia/Tokyo', 'HND': 'Asia/Tokyo', 'ICN': 'Asia/Seoul',
+    'PEK': 'Asia/Shanghai', 'PVG': 'Asia/Shanghai', 'HKG': 'Asia/Hong_Kong',
+    'SIN': 'Asia/Singapore', 'BKK': 'Asia/Bangkok', 'KUL': 'Asia/Kuala_Lumpur',
+    'CGK': 'Asia/Jakarta', 'SYD': 'Australia/Sydney', 'MEL': 'Australia/Melbourne',
+    'BNE': 'Australia/Brisbane', 'AKL': 'Pacific/Auckland', 'DEL': 'Asia/Kolkata',
+    'BOM': 'Asia/Kolkata', 'BLR': 'Asia/Kolkata', 'MAA': 'Asia/Kolkata',
+    'HYD': 'Asia/Kolkata',
+
+    # Middle East & Africa
+    'DXB': 'Asia/Dubai', 'DOH': 'Asia/Qatar', 'AUH': 'Asia/Dubai',
+    'KWI': 'Asia/Kuwait', 'CAI': 'Africa/Cairo', 'JNB': 'Africa/Johannesburg',
+    'CPT': 'Africa/Johannesburg', 'NBO': 'Africa/Nairobi', 'ADD': 'Africa/Addis_Ababa',
+
+    # South America
+    'GRU': 'America/Sao_Paulo', 'GIG': 'America/Sao_Paulo', 'EZE': 'America/Argentina/Buenos_Aires',
+    'SCL': 'America/Santiago', 'LIM': 'America/Lima', 'BOG': 'America/Bogota'
+}
+
+
+def _cumulative_weights(weights):
+    """Normalized cumulative weights for inverse-CDF sampling with searchsorted"""
+    cumulative = np.cumsum(np.asarray(weights, dtype=np.float64))
+    return cumulative / cumulative[-1]
+
+
+def _iso_utc(timestamps):
+    """Format a datetime64 array the way the Aviationstack payload does"""
+    return np.char.add(np.datetime_as_string(timestamps, unit='s'), '+00:00').tolist()
+
+
+# Reference tables as arrays, built once per process instead of once per flight
+_ROUTE_DEP = np.array([route[0] for route in POPULAR_ROUTES])
+_ROUTE_ARR = np.array([route[1] for route in POPULAR_ROUTES])
+_ROUTE_CUMULATIVE = _cumulative_weights([route[2] for route in POPULAR_ROUTES])
+_ROUTE_DURATION = np.array([
+    FLIGHT_DURATIONS.get((route[0], route[1]), DEFAULT_FLIGHT_DURATION) for route in POPULAR_ROUTES
+])
+_ROUTE_DEP_TIMEZONE = np.array([AIRPORT_TIMEZONES.get(route[0], 'UTC') for route in POPULAR_ROUTES])
+_ROUTE_ARR_TIMEZONE = np.array([AIRPORT_TIMEZONES.get(route[1], 'UTC') for route in POPULAR_ROUTES])
+_AIRLINE_CUMULATIVE = _cumulative_weights(AIRLINE_WEIGHTS)
+_HOUR_VALUES = np.array(DEPARTURE_HOURS)
+_HOUR_CUMULATIVE = _cumulative_weights(DEPARTURE_HOUR_WEIGHTS)
+_STATUS_NAMES = np.array([status[0] for status in FLIGHT_STATUSES])
+_STATUS_CUMULATIVE = _cumulative_weights([status[1] for status in FLIGHT_STATUSES])
+_TERMINALS = np.array(TERMINALS)
+_GATE_LETTERS = np.array(GATE_LETTERS)
+_REGISTRATION_SUFFIXES = np.array(REGISTRATION_SUFFIXES)
+_AIRCRAFT_TYPES = np.array(AIRCRAFT_TYPES)
+
+
+class MockFlightGenerator:
+    """Seedable generator that draws all N flights in batched NumPy calls"""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def _weighted(self, cumulative, n):
+        """Draw n indices according to precomputed cumulative weights"""
+        return np.searchsorted(cumulative, self.rng.random(n), side='right')
+
+    def _choice(self, values, n):
+        return values[self.rng.integers(0, len(values), n)]
+
+    def generate_columns(self, n, base_date=None):
+        """
+        Generate n flights as a dict of column arrays
+
+        Args:
+            n: Number of flights to generate
+            base_date: Day the one-week schedule starts from (defaults to today)
+        """
+        rng = self.rng
+        base_date = base_date or datetime.now()
+
+        route = self._weighted(_ROUTE_CUMULATIVE, n)
+        status = _STATUS_NAMES[self._weighted(_STATUS_CUMULATIVE, n)]
+        active = status == 'active'
+
+        # Departure on one of the next 7 days at a weighted hour, in minutes
+        departure_minutes = (
+            rng.integers(0, 7, n) * 1440
+            + _HOUR_VALUES[self._weighted(_HOUR_CUMULATIVE, n)] * 60
+            + rng.integers(0, 60, n)
+        )
+        dep_scheduled = np.datetime64(base_date.date(), 'm') + departure_minutes
+        duration = _ROUTE_DURATION[route] + rng.integers(-30, 31, n)
+        arr_scheduled = dep_scheduled + duration.astype('timedelta64[m]')
+        delay = np.where(status == 'delayed', rng.integers(15, 121, n), 0)
+
+        gates = np.char.add(self._choice(_GATE_LETTERS, 2 * n), rng.integers(1, 51, 2 * n).astype(str))
+        registration = np.char.add(
+            np.char.add('N', rng.integers(100, 1000, n).astype(str)),
+            self._choice(_REGISTRATION_SUFFIXES, n)
+        )
+
+        return {
+            'flight_date': np.datetime_as_string(dep_scheduled, unit='D'),
+            'flight_status': status,
+            'dep_iata': _ROUTE_DEP[route],
+            'arr_iata': _ROUTE_ARR[route],
+            'dep_timezone': _ROUTE_DEP_TIMEZONE[route],
+            'arr_timezone': _ROUTE_ARR_TIMEZONE[route],
+            'dep_terminal': self._choice(_TERMINALS, n),
+            'arr_terminal': self._choice(_TERMINALS, n),
+            'dep_gate': gates[:n],
+            'arr_gate': gates[n:],
+            'dep_scheduled': dep_scheduled,
+            'dep_estimated': dep_scheduled + delay.astype('timedelta64[m]'),
+            'arr_scheduled': arr_scheduled,
+            'arr_estimated': arr_scheduled + delay.astype('timedelta64[m]'),
+            'delay': delay,
+            'airline': self._weighted(_AIRLINE_CUMULATIVE, n),
+            'flight_number': rng.integers(1000, 10000, n).astype(str),
+            'registration': registration,
+            'aircraft_iata': self._choice(_AIRCRAFT_TYPES, n),
+            'aircraft_icao': self._choice(_AIRCRAFT_TYPES, n),
+            'latitude': np.round(rng.uniform(25.0, 50.0, n), 6),
+            'longitude': np.round(rng.uniform(-125.0, -65.0, n), 6),
+            'altitude': np.where(active, rng.integers(30000, 42001, n), 0),
+            'direction': rng.integers(0, 361, n),
+            'speed_horizontal': np.where(active, rng.integers(400, 601, n), 0),
+            'speed_vertical': np.where(active, rng.integers(-10, 11, n), 0)
+        }
+
+    def generate_records(self, n, base_date=None):
+        """Generate n flights as nested Aviationstack-shaped records"""
+        columns = self.generate_columns(n, base_date)
+        updated = datetime.now().isoformat() + "+00:00"
+
+        rows = zip(
+            columns['flight_date'].tolist(), columns['flight_status'].tolist(),
+            columns['dep_iata'].tolist(), columns['arr_iata'].tolist(),
+            columns['dep_timezone'].tolist(), columns['arr_timezone'].tolist(),
+            columns['dep_terminal'].tolist(), columns['arr_terminal'].tolist(),
+            columns['dep_gate'].tolist(), columns['arr_gate'].tolist(),
+            _iso_utc(columns['dep_scheduled']), _iso_utc(columns['dep_estimated']),
+            _iso_utc(columns['arr_scheduled']), _iso_utc(columns['arr_estimated']),
+            columns['delay'].tolist(), columns['airline'].tolist(),
+            columns['flight_number'].tolist(), columns['registration'].tolist(),
+            columns['aircraft_iata'].tolist(), columns['aircraft_icao'].tolist(),
+            columns['latitude'].tolist(), columns['longitude'].tolist(),
+            columns['altitude'].tolist(), columns['direction'].tolist(),
+            columns['speed_horizontal'].tolist(), columns['speed_vertical'].tolist()
+        )
+
+        # The loop only allocates acyclic containers, so pausing the cyclic
+        # collector avoids repeated full scans of the growing result list
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            flights = self._build_records(rows, updated)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return flights
+
+    @staticmethod
+    def _build_records(rows, updated):
+        flights = []
+        for (flight_date, flight_status, dep_iata, arr_iata, dep_timezone, arr_timezone,
+             dep_terminal, arr_terminal, dep_gate, arr_gate, dep_scheduled, dep_estimated,
+             arr_scheduled, arr_estimated, delay, airline_index, flight_number, registration,
+             aircraft_iata, aircraft_icao, latitude, longitude, altitude, direction,
+             speed_horizontal, speed_vertical) in rows:
+            landed = flight_status == 'landed'
+            reports_delay = landed or flight_status == 'delayed'
+            airline = AIRLINES[airline_index]
+
+            flights.append({
+                "flight_date": flight_date,
+                "flight_status": flight_status,
+                "departure": {
+                    "airport": AIRPORTS[dep_iata],
+                    "timezone": dep_timezone,
+                    "iata": dep_iata,
+                    "icao": f"K{dep_iata}",
+                    "terminal": dep_terminal,
+                    "gate": dep_gate,
+                    "scheduled": dep_scheduled,
+                    "estimated": dep_estimated,
+                    "actual": dep_estimated if landed else None,
+                    "delay": delay if reports_delay else None
+                },
+                "arrival": {
+                    "airport": AIRPORTS[arr_iata],
+                    "timezone": arr_timezone,
+                    "iata": arr_iata,
+                    "icao": f"K{arr_iata}",
+                    "terminal": arr_terminal,
+                    "gate": arr_gate,
+                    "scheduled": arr_scheduled,
+                    "estimated": arr_estimated,
+                    "actual": arr_estimated if landed else None,
+                    "delay": delay if reports_delay else None
+                },
+                "airline": dict(airline),
+                "flight": {
+                    "number": flight_number,
+                    "iata": f"{airline['iata']}{flight_number}",
+                    "icao": f"{airline['icao']}{flight_number}"
+                },
+                "aircraft": {
+                    "registration": registration,
+                    "iata": aircraft_iata,
+                    "icao": aircraft_icao
+                },
+                "live": {
+                    "updated": updated,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "altitude": altitude,
+                    "direction": direction,
+                    "speed_horizontal": speed_horizontal,
+                    "speed_vertical": speed_vertical,
+                    "is_ground": flight_status != 'active'
+                }
+            })
+
+        return flights
+
+    def generate(self, n=300, base_date=None):
+        """Generate n flights wrapped in an Aviationstack-style response"""
+        flights = self.generate_records(n, base_date)
+        return {
+            "pagination": {
+                "limit": n,
+                "offset": 0,
+                "count": len(flights),
+                "total": len(flights)
+            },
+            "data": flights
+        }
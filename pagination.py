@@ -0,0 +1,99 @@
+"""
+Pagination helpers for Airline Data Analytics Dashboard
+Bounded query parsing, opaque cursors and field projection for /api/data
+"""
+
+import base64
+import binascii
+import json
+
+
+def parse_bounded_int(value, default, minimum, maximum, name='value'):
+    """Parse an integer query parameter, clamping it to [minimum, maximum]"""
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an integer")
+    return max(minimum, min(number, maximum))
+
+
+def encode_cursor(state):
+    """Encode pagination state as an opaque URL-safe token"""
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+# Cursor entries holding integers; every other entry is a query string argument
+CURSOR_INTEGERS = ('offset', 'limit', 'page_size')
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by encode_cursor
+
+    The token is unsigned client input, so every entry is checked to have the
+    type the handlers expect before any of it is parsed.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("'cursor' is invalid")
+    if not isinstance(state, dict) or not isinstance(state.get('offset'), int) or state['offset'] < 0:
+        raise ValueError("'cursor' is invalid")
+    for name, value in state.items():
+        expected = int if name in CURSOR_INTEGERS else str
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError("'cursor' is invalid")
+    return state
+
+
+def parse_fields(value):
+    """
+    Parse a comma-separated list of dotted field paths into a projection tree
+
+    Example: 'flight_status,departure.iata' -> {'flight_status': None, 'departure': {'iata': None}}
+    Returns None when no projection was requested.
+    """
+    if not value:
+        return None
+
+    tree = {}
+    for path in value.split(','):
+        parts = [part.strip() for part in path.split('.')]
+        if not all(parts):
+            raise ValueError(f"'fields' contains an invalid path: {path!r}")
+        node = tree
+        for part in parts[:-1]:
+            child = node.get(part, {})
+            if child is None:
+                # The whole parent object was already requested
+                break
+            node = node.setdefault(part, child)
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+def project_record(record, tree):
+    """Keep only the fields of record named in the projection tree"""
+    projected = {}
+    for key, subtree in tree.items():
+        if key not in record:
+            continue
+        value = record[key]
+        if subtree is not None and isinstance(value, dict):
+            value = project_record(value, subtree)
+        projected[key] = value
+    return projected
+
+
+def paginate(records, offset, page_size, fields=None):
+    """Slice one page of records and apply the optional field projection"""
+    page = records[offset:offset + page_size]
+    if fields is not None:
+        page = [project_record(record, fields) for record in page]
+    next_offset = offset + page_size
+    return page, (next_offset if next_offset < len(records) else None)
@@ -0,0 +1,115 @@
+"""
+Request Profiling for Airline Data Analytics Dashboard
+Opt-in cProfile capture of request handlers into a bounded ring of profile files
+"""
+
+import cProfile
+import functools
+import hmac
+import logging
+import os
+import random
+import threading
+from datetime import datetime
+
+from flask import make_response, request
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = '.prof'
+
+# One profile at a time per process: the profiler hook is process-wide on newer
+# Pythons, and this also caps the overhead when the sample rate is set too high
+_profile_lock = threading.Lock()
+
+
+def _requested(token):
+    """Whether this request asks to be profiled with the admin token"""
+    supplied = request.args.get('profile')
+    return bool(token and supplied) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+class RequestProfiler:
+    """Profiles sampled or explicitly requested calls of a handler and keeps the newest dumps"""
+
+    def __init__(self, directory, token=None, sample_rate=0.0, max_files=None):
+        """
+        Args:
+            directory: Directory the .prof files are written to
+            token: Admin token that profiles a request passed as ?profile=<token>; empty disables it
+            sample_rate: Fraction of requests profiled without a token
+            max_files: Profiles retained; the oldest are deleted beyond this
+        """
+        self.directory = directory
+        self.token = token
+        self.sample_rate = sample_rate
+        self.max_files = max_files or Config.PROFILE_MAX_FILES
+
+    @property
+    def enabled(self):
+        return bool(self.directory) and (bool(self.token) or self.sample_rate > 0)
+
+    def should_profile(self):
+        if not self.enabled:
+            return False
+        return _requested(self.token) or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def profiled(self, handler):
+        """Decorate a Flask view so that selected requests run under cProfile"""
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            if not self.should_profile() or not _profile_lock.acquire(blocking=False):
+                return handler(*args, **kwargs)
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    response = handler(*args, **kwargs)
+                finally:
+                    profile.disable()
+                path = self._dump(profile, handler.__name__)
+            finally:
+                _profile_lock.release()
+            if path is not None and _requested(self.token):
+                # Only tell the admin who asked where to find it
+                response = self._tag(response, os.path.basename(path))
+            return response
+        return wrapper
+
+    def _tag(self, response, name):
+        response = make_response(response)
+        response.headers['X-Profile'] = name
+        return response
+
+    def _dump(self, profile, name):
+        """Write one profile and trim the ring; returns its path, or None on failure"""
+        stamp = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+        path = os.path.join(self.directory, f'{stamp}-{name}-{os.getpid()}{PROFILE_SUFFIX}')
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+            self._trim()
+        except OSError as e:
+            logger.error(f"Could not write request profile: {str(e)}")
+            return None
+        return path
+
+    def _trim(self):
+        """Delete the oldest profiles beyond max_files"""
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(PROFILE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                profiles.append((os.stat(path).st_mtime_ns, path))
+            except FileNotFoundError:
+                continue  # Trimmed concurrently by another worker
+        profiles.sort()
+        for _, path in profiles[:-self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -4,6 +4,7 @@ Startup script for Airline Data Analytics Dashboard
 This script provides a convenient way to run the application
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -13,20 +14,19 @@ from pathlib import Path
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    required_packages = [
-        'flask',
-        'pandas',
-        'requests',
-        'plotly',
-        'beautifulsoup4',
-        'python-dotenv'
-    ]
+    # Package name -> module it installs; looked up without importing anything
+    required_packages = {
+        'flask': 'flask',
+        'pandas': 'pandas',
+        'requests': 'requests',
+        'plotly': 'plotly',
+        'beautifulsoup4': 'bs4',
+        'python-dotenv': 'dotenv'
+    }
     
     missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
+    for package, module in required_packages.items():
+        if importlib.util.find_spec(module) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -0,0 +1,124 @@
+"""
+JSON Serialization for Airline Data Analytics Dashboard
+Pluggable fast encoder for API responses with native numpy, pandas and datetime support
+"""
+
+import json
+import logging
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+from config import Config
+from metrics import timed
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is always available
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj):
+    """Encode the values neither backend handles natively"""
+    if isinstance(obj, (pd.Timestamp, datetime, date)):
+        return None if pd.isna(obj) else obj.isoformat()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (np.ndarray, pd.Series, pd.Index)):
+        return obj.tolist()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def _orjson_sorted(obj):
+    """
+    JSON bytes of obj with sorted keys, ordering non-string keys as the stdlib encoder does
+
+    orjson sorts keys by their text, hour "10" before "7". Any subtree with
+    only string keys is still encoded and sorted by orjson in one call; only
+    the dicts and lists above a non-string key are assembled here.
+    """
+    try:
+        # Without OPT_NON_STR_KEYS a non-string key raises, so this sort only ever compares strings
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS)
+    except TypeError:
+        if isinstance(obj, dict):
+            # Each key and its colon as orjson renders them, e.g. 7 -> "7":, cut from a one-item object
+            return b'{' + b','.join(
+                orjson.dumps({key: 0}, option=orjson.OPT_NON_STR_KEYS)[1:-2] + _orjson_sorted(value)
+                for key, value in sorted(obj.items())
+            ) + b'}'
+        if isinstance(obj, (list, tuple)):
+            return b'[' + b','.join(_orjson_sorted(value) for value in obj) + b']'
+        raise
+
+
+def _orjson_dumps(obj, sort_keys=False):
+    if sort_keys:
+        return _orjson_sorted(obj)
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+def _stdlib_dumps(obj, sort_keys=False):
+    return json.dumps(obj, default=_default, sort_keys=sort_keys, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+# Name -> (dumps returning bytes, loads accepting str or bytes)
+SERIALIZERS = {'stdlib': (_stdlib_dumps, json.loads)}
+if orjson is not None:
+    SERIALIZERS['orjson'] = (_orjson_dumps, orjson.loads)
+
+
+def select_serializer(name):
+    """
+    (dumps, loads) of the named backend; 'auto' picks the fastest one installed
+
+    Raises ValueError for an unknown name. A known backend that is not
+    installed falls back to the standard library with a warning.
+    """
+    if name == 'auto':
+        name = 'orjson' if 'orjson' in SERIALIZERS else 'stdlib'
+    if name not in SERIALIZERS:
+        if name == 'orjson':
+            logger.warning("JSON_SERIALIZER is 'orjson' but orjson is not installed; using the stdlib encoder")
+            return SERIALIZERS['stdlib']
+        raise ValueError(f"Unknown JSON serializer {name!r}; choose from auto, {', '.join(sorted(SERIALIZERS))}")
+    return SERIALIZERS[name]
+
+
+_dumps, _loads = select_serializer(Config.JSON_SERIALIZER)
+
+
+def dumps(obj, sort_keys=False):
+    """Compact UTF-8 JSON bytes of obj"""
+    return _dumps(obj, sort_keys=sort_keys)
+
+
+def loads(data):
+    """Decode JSON from str or bytes"""
+    return _loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by the configured serializer, timing each response body"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Encoded straight to bytes; no pretty-printing, so debug mode sees production output
+        with timed('serialize'):
+            body = dumps(obj, sort_keys=self.sort_keys) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
@@ -0,0 +1,252 @@
+"""
+Shared Snapshot for Airline Data Analytics Dashboard
+Memory-mapped snapshot file published by one worker and read by all others
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from flight_table import FlightPayload
+from local_state import ensure_private_dir
+from serialization import dumps, loads
+from snapshot import Snapshot
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; every worker then keeps its own snapshot
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'AFSNAP02'
+
+# Magic, then the length of the JSON header; column blocks follow the header
+_PREAMBLE = struct.Struct('<8sQ')
+
+_ALIGNMENT = 8
+
+
+class SharedRecords(Sequence):
+    """Read-only flight records decoded on access from a mapped block of JSON rows"""
+
+    def __init__(self, rows, offsets):
+        self._rows = rows
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('flight index out of range')
+        return loads(self.raw(index))
+
+    def raw(self, index):
+        """Encoded JSON bytes of one record, without decoding it"""
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._rows[start:end].tobytes()
+
+
+def _encode_rows(flights):
+    encoded = [dumps(flight) for flight in flights]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in encoded], out=offsets[1:])
+    return b''.join(encoded), offsets
+
+
+def _encode_column(series):
+    """Split one table column into a fixed-width array and the spec needed to rebuild it"""
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        return series.dt.tz_convert(None).to_numpy(), {'kind': 'datetime', 'tz': str(series.dt.tz)}
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        return series.to_numpy(), {'kind': 'datetime', 'tz': None}
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(), {'kind': 'numeric'}
+    # Categorical columns share their codes; free-text columns are dictionary-encoded first
+    categorical = series.array if isinstance(series.dtype, pd.CategoricalDtype) else pd.Categorical(series)
+    return categorical.codes, {'kind': 'category', 'categories': categorical.categories.tolist()}
+
+
+def _decode_column(values, spec):
+    if spec['kind'] == 'category':
+        return pd.Series(pd.Categorical.from_codes(values, categories=spec['categories'], validate=False),
+                         copy=False)
+    series = pd.Series(values, copy=False)
+    if spec['kind'] == 'datetime' and spec['tz']:
+        # Localizing to the stored zone is the one column type pandas copies
+        series = series.dt.tz_localize(spec['tz'])
+    return series
+
+
+def _pack_keys(obj):
+    """Tag dicts with non-string keys, like hour tallies, so they survive a JSON round trip"""
+    if isinstance(obj, dict):
+        if all(isinstance(key, str) for key in obj):
+            return {key: _pack_keys(value) for key, value in obj.items()}
+        return {'__items__': [[key, _pack_keys(value)] for key, value in obj.items()]}
+    if isinstance(obj, (list, tuple)):
+        return [_pack_keys(value) for value in obj]
+    return obj
+
+
+def _unpack_keys(obj):
+    if isinstance(obj, dict):
+        if set(obj) == {'__items__'}:
+            return {key: _unpack_keys(value) for key, value in obj['__items__']}
+        return {key: _unpack_keys(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_unpack_keys(value) for value in obj]
+    return obj
+
+
+def _padding(length):
+    return -length % _ALIGNMENT
+
+
+class SharedSnapshotFile:
+    """
+    Snapshot published to a memory-mapped file so every worker serves the same copy
+
+    The worker holding the publisher lock fetches and writes each new snapshot;
+    the rest map the file read-only. Table columns and raw flight rows stay in
+    the shared page cache, so per-worker memory does not grow with the dataset.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, 'snapshot.bin')
+        self._lock_path = os.path.join(directory, 'publisher.lock')
+        self._lock_file = None
+        self._publisher_pid = None
+        self._loaded_stat = None
+        ensure_private_dir(directory)
+
+    @property
+    def is_publisher(self):
+        return self._lock_file is not None and self._publisher_pid == os.getpid()
+
+    def claim(self):
+        """
+        Try to become the publishing worker without blocking
+
+        The lock is held for the life of the process, so when the publisher
+        exits another worker takes over on its next refresh.
+        """
+        if self.is_publisher:
+            return True
+        lock_file = open(self._lock_path, 'a+')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self._publisher_pid = os.getpid()
+        logger.info(f"Worker {self._publisher_pid} is publishing the shared snapshot")
+        return True
+
+    def publish(self, snapshot):
+        """Write snapshot to a new file and swap it in atomically"""
+        table = snapshot.data.table
+        rows, offsets = _encode_rows(snapshot.data.get('data') or [])
+
+        blocks = [('offsets', offsets), ('rows', np.frombuffer(rows, dtype=np.uint8))]
+        columns = []
+        for name in table.columns:
+            values, spec = _encode_column(table[name])
+            spec['name'] = name
+            columns.append(spec)
+            blocks.append((name, np.ascontiguousarray(values)))
+
+        layout = {}
+        position = 0
+        for name, values in blocks:
+            layout[name] = (position, values.dtype.str, len(values))
+            position += values.nbytes + _padding(values.nbytes)
+
+        header = dumps(_pack_keys({
+            'version': snapshot.version,
+            'created_at': snapshot.created_at,
+            'stale': snapshot.stale,
+            'error': snapshot.error,
+            'insights': snapshot.insights,
+            'pagination': snapshot.data.get('pagination'),
+            'columns': columns,
+            'layout': layout
+        }))
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_PREAMBLE.pack(MAGIC, len(header)))
+                f.write(header)
+                f.write(b'\0' * _padding(_PREAMBLE.size + len(header)))
+                for _, values in blocks:
+                    f.write(values.tobytes())
+                    f.write(b'\0' * _padding(values.nbytes))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Could not publish shared snapshot: {str(e)}")
+
+    def load_if_changed(self):
+        """Map the published snapshot if it changed since the last load, else None"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        if (stat.st_ino, stat.st_mtime_ns) == self._loaded_stat:
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                # The file may have been swapped since stat(); identify what was actually opened
+                stat = os.fstat(f.fileno())
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_length = _PREAMBLE.unpack_from(buffer, 0)
+            if magic != MAGIC:
+                raise ValueError('not a snapshot file')
+            header = _unpack_keys(loads(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+            start = _PREAMBLE.size + header_length
+            start += _padding(start)
+
+            # Arrays view the mapping directly; it stays open while any of them is referenced
+            arrays = {
+                name: np.frombuffer(buffer, dtype=dtype, count=count, offset=start + offset)
+                for name, (offset, dtype, count) in header['layout'].items()
+            }
+            table = pd.DataFrame({spec['name']: _decode_column(arrays[spec['name']], spec)
+                                  for spec in header['columns']}, copy=False)
+            payload = {
+                'pagination': header['pagination'],
+                'data': SharedRecords(memoryview(arrays['rows']), arrays['offsets'])
+            }
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable shared snapshot {self.path}: {str(e)}")
+            return None
+
+        self._loaded_stat = (stat.st_ino, stat.st_mtime_ns)
+        return Snapshot(FlightPayload(payload, table=table, version=header['version']),
+                        header['insights'], header['created_at'],
+                        stale=header['stale'], error=header['error'])
+
+
+def open_shared_snapshot(directory):
+    """SharedSnapshotFile in directory, or None where file locks are unavailable"""
+    if fcntl is None or not directory:
+        return None
+    try:
+        return SharedSnapshotFile(directory)
+    except OSError as e:
+        logger.warning(f"Shared snapshot disabled: {str(e)}")
+        return None
@@ -0,0 +1,164 @@
+"""
+Request coalescing for Airline Data Analytics Dashboard
+Single-flight execution of identical upstream fetches within and across workers
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+from local_state import ensure_private_dir
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; coalescing is then per process only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight execution that other callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CoalescedError(RuntimeError):
+    """A call failed in another worker moments ago; raised instead of repeating it"""
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its result with every waiter"""
+
+    def __init__(self, namespace, lock_dir=None, ttl=None, error_ttl=None):
+        """
+        Args:
+            namespace: Prefix separating this instance's keys from other callers
+            lock_dir: Directory for cross-process lock and result files, or None for in-process only;
+                results are unpickled from it, so it must belong to this user alone
+            ttl: Seconds a result published by another process may be reused
+            error_ttl: Seconds a failure published by another process is raised again instead of
+                retrying the call, so workers queued on the lock do not each repeat it in turn
+        """
+        self.namespace = namespace
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+        if self.lock_dir:
+            try:
+                ensure_private_dir(self.lock_dir)
+            except OSError as e:
+                logger.error(f"Coalescing {namespace} fetches within this process only: {str(e)}")
+                self.lock_dir = None
+
+    def do(self, key, fn):
+        """Call fn() for key unless an identical call is already running, then share its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_exclusive(key, fn) if self.lock_dir else fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _paths(self, key):
+        digest = hashlib.sha1(f'{self.namespace}:{key!r}'.encode('utf-8')).hexdigest()
+        base = os.path.join(self.lock_dir, digest)
+        return base + '.lock', base + '.pickle', base + '.error'
+
+    def _run_exclusive(self, key, fn):
+        """Hold a per-key file lock so only one worker process fetches; others reuse its outcome"""
+        lock_path, result_path, error_path = self._paths(key)
+        with open(lock_path, 'a+') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                result = self._read_fresh(result_path)
+                if result is not None:
+                    self.coalesced += 1
+                    return result
+                error = self._read_error(error_path)
+                if error is not None:
+                    self.coalesced += 1
+                    raise CoalescedError(error)
+                try:
+                    result = fn()
+                except Exception as e:
+                    self._publish_error(error_path, e)
+                    raise
+                self._publish(result_path, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_fresh(self, result_path):
+        try:
+            if self.ttl is None or time.time() - os.path.getmtime(result_path) >= self.ttl:
+                return None
+            with open(result_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable single-flight result {result_path}: {str(e)}")
+            return None
+
+    def _read_error(self, error_path):
+        """Message of a failure published within error_ttl, or None"""
+        try:
+            if not self.error_ttl or time.time() - os.path.getmtime(error_path) >= self.error_ttl:
+                return None
+            with open(error_path) as f:
+                return json.load(f)['message']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable single-flight error {error_path}: {str(e)}")
+            return None
+
+    def _publish_error(self, error_path, error):
+        if not self.error_ttl:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.lock_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'message': f'{type(error).__name__}: {str(error)}'}, f)
+            os.replace(tmp_path, error_path)
+        except Exception as e:
+            logger.warning(f"Could not publish single-flight error: {str(e)}")
+
+    def _publish(self, result_path, result):
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.lock_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, result_path)
+        except Exception as e:
+            logger.warning(f"Could not publish single-flight result: {str(e)}")
@@ -0,0 +1,251 @@
+"""
+Snapshot Store for Airline Data Analytics Dashboard
+Background refresher serving versioned, immutable flight snapshots
+"""
+
+import logging
+import os
+import threading
+import time
+
+from analytics import aggregate_data
+from cache import TTLCache, fingerprint, flight_query_key
+from config import Config
+from flight_index import FlightIndex
+from flight_table import FlightPayload, ingest
+from metrics import timed
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """One fetched dataset with its precomputed insights; never mutated after creation"""
+
+    __slots__ = ('data', 'insights', 'version', 'created_at', 'stale', 'error', '_views', '_index')
+
+    def __init__(self, data, insights, created_at=None, stale=False, error=None):
+        self.data = data
+        self.insights = insights
+        self.version = data.version
+        self.created_at = created_at or time.time()
+        self.stale = stale
+        self.error = error
+        self._views = TTLCache(ttl=None, maxsize=Config.SNAPSHOT_VIEW_CACHE_ENTRIES)
+        self._index = None
+
+    @property
+    def age(self):
+        """Seconds since the underlying data was fetched"""
+        return time.time() - self.created_at
+
+    @property
+    def index(self):
+        """Inverted indexes over this snapshot's table, built on first use"""
+        # Building twice under a race is harmless; both results are identical
+        if self._index is None:
+            self._index = FlightIndex(self.data.table)
+        return self._index
+
+    def mark_stale(self, error):
+        """Copy of this snapshot flagged as stale after a failed refresh"""
+        stale = Snapshot(self.data, self.insights, self.created_at, stale=True, error=str(error))
+        stale._index = self._index
+        return stale
+
+    def describe(self):
+        """
+        Snapshot metadata for API responses
+
+        Only the version: bodies are tagged and their compressed forms cached by
+        an ETag derived from it, so anything that changes under the same version,
+        like the age or a failed refresh, is reported in X-Snapshot-* headers only.
+        """
+        return {'version': self.version}
+
+    def query(self, route_from=None, route_to=None, limit=None):
+        """
+        Flights matching a route filter, as a versioned payload with its own table
+
+        Views are derived from the in-memory snapshot only and memoized per
+        snapshot, so answering a filtered query never touches the network.
+        """
+        route_from, route_to, limit = flight_query_key(route_from, route_to, limit or 0)
+        flights = self.data.get('data') or []
+        if not route_from and not route_to and (not limit or limit >= len(flights)):
+            return self.data
+        return self._views.get_or_set((route_from, route_to, limit),
+                                      lambda: self._build_view(route_from, route_to, limit))
+
+    def _build_view(self, route_from, route_to, limit):
+        table = self.data.table
+        positions = self.index.select(dep_iata=route_from, arr_iata=route_to)
+        if limit:
+            positions = positions[:limit]
+
+        flights = self.data.get('data') or []
+        rows = [flights[position] for position in positions.tolist()]
+        payload = {
+            'pagination': {
+                'limit': limit or len(rows),
+                'offset': 0,
+                'count': len(rows),
+                'total': len(rows)
+            },
+            'data': rows
+        }
+        return FlightPayload(payload, table=table.iloc[positions].reset_index(drop=True),
+                             version=fingerprint([self.version, route_from, route_to, limit]))
+
+
+class SnapshotStore:
+    """Holds the latest Snapshot and refreshes it on a background thread"""
+
+    def __init__(self, fetch, fallback=None, analyze=None, interval=None, shared=None, history=None):
+        """
+        Args:
+            fetch: Callable returning a fresh Aviationstack-style payload; raises on failure
+            fallback: Callable returning a payload when no snapshot exists yet and fetch fails
+            analyze: Callable computing insights for a payload
+            interval: Seconds between background refreshes
+            shared: Optional SharedSnapshotFile through which one worker publishes for all
+            history: Optional FlightHistory that every freshly fetched dataset is appended to
+        """
+        self._fetch = fetch
+        self._fallback = fallback
+        self._analyze = analyze or self._update_insights
+        self.interval = interval or Config.SNAPSHOT_REFRESH_INTERVAL
+        self._shared = shared
+        self._history = history
+        self._shared_checked_at = 0
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_pid = None
+
+    def _update_insights(self, data):
+        # Recomputed in full: one bincount pass per tally is cheaper than diffing against the last table
+        return aggregate_data(data).to_insights()
+
+    def current(self):
+        """Latest snapshot; only the very first call in a process may block on a fetch"""
+        self.start()
+        self._follow_shared()
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._refresh_lock:
+                if self._snapshot is None:
+                    self._refresh_locked()
+            snapshot = self._snapshot
+        return snapshot
+
+    def warm(self):
+        """
+        Fetch a first snapshot without starting the refresher or claiming the shared file
+
+        For a preforking server's master process: the forked workers inherit
+        the snapshot, and it is published for workers that map the shared file,
+        so none of them waits on the upstream at boot. current() must not be
+        used there, as neither the refresher thread nor the publisher lock
+        survive a fork.
+        """
+        with self._refresh_lock:
+            if self._snapshot is None:
+                self._update_locked()
+            if self._shared is not None:
+                self._shared.publish(self._snapshot)
+        return self._snapshot
+
+    def refresh(self):
+        """Fetch and publish a new snapshot, or mark the current one stale on failure"""
+        with self._refresh_lock:
+            self._refresh_locked()
+
+    def _follow_shared(self):
+        """Adopt a newer snapshot published by another worker, checking at most every poll interval"""
+        if self._shared is None or self._shared.is_publisher:
+            return
+        now = time.monotonic()
+        if now - self._shared_checked_at < Config.SHARED_SNAPSHOT_POLL_INTERVAL:
+            return
+        # Never queue requests behind a refresh; the next request will check again
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._shared_checked_at = now
+            snapshot = self._shared.load_if_changed()
+            if snapshot is not None:
+                self._snapshot = snapshot
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh_locked(self):
+        if self._shared is not None and not self._shared.claim():
+            # Another worker fetches and publishes; only fetch here if it has not published yet
+            snapshot = self._shared.load_if_changed()
+            if snapshot is not None:
+                self._snapshot = snapshot
+            if self._snapshot is not None:
+                return
+
+        previous = self._snapshot
+        self._update_locked()
+        if self._shared is not None and self._shared.is_publisher and self._snapshot is not previous:
+            self._shared.publish(self._snapshot)
+
+    @timed('snapshot_refresh')
+    def _update_locked(self):
+        # Readers never wait on this; a failure keeps the previous snapshot, marked stale
+        previous = self._snapshot
+        try:
+            data = ingest(self._fetch())
+            if not isinstance(data, FlightPayload):
+                raise ValueError('upstream returned an empty payload')
+            stale, error = False, None
+        except Exception as e:
+            logger.warning(f"Snapshot refresh failed: {str(e)}")
+            if previous is not None:
+                self._snapshot = previous.mark_stale(e)
+                return
+            if self._fallback is None:
+                raise
+            data = ingest(self._fallback())
+            stale, error = True, str(e)
+
+        if previous is not None and previous.version == data.version and not stale:
+            # Same content: keep the existing snapshot and its memoized views
+            if previous.stale:
+                self._snapshot = Snapshot(previous.data, previous.insights)
+            return
+
+        # Publishing is a single reference assignment, so readers see either snapshot whole
+        self._snapshot = Snapshot(data, self._analyze(data), stale=stale, error=error)
+
+        if self._history is not None and not stale:
+            try:
+                self._history.append(data.get('data') or [], fetched_at=self._snapshot.created_at)
+            except Exception as e:
+                logger.error(f"Could not record snapshot in history: {str(e)}")
+
+    def start(self):
+        """Start the background refresher in this process if it is not running"""
+        if self._thread is not None and self._thread_pid == os.getpid():
+            return
+        with self._refresh_lock:
+            if self._thread is not None and self._thread_pid == os.getpid():
+                return
+            # Threads do not survive a fork, so each worker starts its own refresher
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='snapshot-refresher', daemon=True)
+            self._thread_pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Snapshot refresher error: {str(e)}")
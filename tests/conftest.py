@@ -0,0 +1,54 @@
+"""
+Test configuration for Airline Data Analytics Dashboard
+Keeps tests off the network and away from a running server's shared state
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Set before any application module reads its configuration
+os.environ['SNAPSHOT_SOURCE'] = 'mock'
+os.environ['SHARED_SNAPSHOT_DIR'] = ''
+os.environ['HISTORY_DIR'] = ''
+os.environ['METRICS_DIR'] = ''
+os.environ['SINGLE_FLIGHT_DIR'] = tempfile.mkdtemp(prefix='airline-tests-singleflight-')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def serve_snapshot(monkeypatch):
+    """Test client of the app serving a fixed payload as its snapshot, never refreshed"""
+    import app as dashboard
+    from snapshot import SnapshotStore
+
+    def serve(data):
+        store = SnapshotStore(fetch=lambda: data, interval=24 * 3600)
+        monkeypatch.setattr(dashboard, 'snapshots', store)
+        store.current()
+        return dashboard.app.test_client()
+
+    return serve
+
+
+@pytest.fixture
+def upstream():
+    """Local Aviationstack stand-in without added latency, shut down after the test"""
+    import threading
+    from loadtest import FakeAviationstack
+
+    servers = []
+
+    def start(**kwargs):
+        server = FakeAviationstack(**{'latency': 0, 'jitter': 0, **kwargs})
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
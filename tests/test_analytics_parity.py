@@ -0,0 +1,154 @@
+import random
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from data_scraper import AdvancedAirlineScraper
+from flight_table import ingest
+from mock_generator import MockFlightGenerator
+
+ON_TIME = ['scheduled', 'active', 'landed']
+
+
+# Reference implementations, as in the original app.py and data_scraper.py
+
+def reference_hours(flights):
+    hours = []
+    for flight in flights:
+        if flight.get('departure') and flight['departure'].get('scheduled'):
+            try:
+                hours.append(datetime.fromisoformat(flight['departure']['scheduled'].replace('Z', '+00:00')).hour)
+            except ValueError:
+                continue
+    return hours
+
+
+def reference_airports(flights):
+    airports = []
+    for flight in flights:
+        if flight.get('departure'):
+            airports.append(flight['departure']['iata'])
+        if flight.get('arrival'):
+            airports.append(flight['arrival']['iata'])
+    return airports
+
+
+def reference_routes(flights):
+    return [f"{f['departure']['iata']}-{f['arrival']['iata']}" for f in flights if f.get('departure') and f.get('arrival')]
+
+
+def reference_process_data(flights):
+    airlines = [f['airline']['name'] for f in flights if f.get('airline')]
+    hours = reference_hours(flights)
+    return {
+        'total_flights': len(flights),
+        'popular_routes': pd.Series(reference_routes(flights)).value_counts().head(10).to_dict(),
+        'airline_distribution': pd.Series(airlines).value_counts().head(10).to_dict(),
+        'peak_times': pd.Series(hours).value_counts().head(10).to_dict() if hours else {},
+        'airport_activity': pd.Series(reference_airports(flights)).value_counts().head(10).to_dict()
+    }
+
+
+def reference_market_insights(flights):
+    route_counts = pd.Series(reference_routes(flights)).value_counts()
+    airline_counts = pd.Series([f['airline']['name'] for f in flights if f.get('airline')]).value_counts()
+
+    route_data = {}
+    for flight in flights:
+        if not (flight.get('departure') and flight.get('arrival')):
+            continue
+        route = f"{flight['departure']['iata']}-{flight['arrival']['iata']}"
+        data = route_data.setdefault(route, {'flights': 0, 'airlines': set(), 'on_time_rate': 0, 'avg_delay': 0})
+        data['flights'] += 1
+        data['airlines'].add(flight['airline']['name'])
+        if flight['flight_status'] in ON_TIME:
+            data['on_time_rate'] += 1
+    for data in route_data.values():
+        data['airlines'] = len(data['airlines'])
+        data['on_time_rate'] = round(data['on_time_rate'] / data['flights'] * 100, 2)
+
+    airline_metrics = {}
+    for flight in flights:
+        if not flight.get('airline'):
+            continue
+        metrics = airline_metrics.setdefault(flight['airline']['name'], {
+            'total_flights': 0, 'routes_served': set(), 'aircraft_types': set(), 'on_time_performance': 0
+        })
+        metrics['total_flights'] += 1
+        if flight.get('departure') and flight.get('arrival'):
+            metrics['routes_served'].add(f"{flight['departure']['iata']}-{flight['arrival']['iata']}")
+        if flight.get('aircraft'):
+            metrics['aircraft_types'].add(flight['aircraft']['iata'])
+        if flight['flight_status'] in ON_TIME:
+            metrics['on_time_performance'] += 1
+    for metrics in airline_metrics.values():
+        metrics['routes_served'] = len(metrics['routes_served'])
+        metrics['aircraft_types'] = len(metrics['aircraft_types'])
+        metrics['on_time_performance'] = round(metrics['on_time_performance'] / metrics['total_flights'] * 100, 2)
+
+    statuses = [f['flight_status'] for f in flights if f.get('flight_status')]
+    status_counts = pd.Series(statuses).value_counts()
+    hour_counts = pd.Series(reference_hours(flights)).value_counts().sort_index()
+
+    return {
+        'market_analysis': {
+            'top_routes': route_counts.head(10).to_dict(),
+            'market_leaders': airline_counts.head(5).to_dict(),
+            'market_concentration': len(airline_counts),
+            'route_diversity': len(route_counts)
+        },
+        'route_performance': dict(sorted(route_data.items(), key=lambda x: x[1]['flights'], reverse=True)[:10]),
+        'airline_metrics': dict(sorted(airline_metrics.items(),
+                                       key=lambda x: x[1]['total_flights'], reverse=True)[:5]),
+        'operational_insights': {
+            'busiest_airports': pd.Series(reference_airports(flights)).value_counts().head(10).to_dict(),
+            'flight_status_distribution': status_counts.to_dict(),
+            'operational_efficiency': round(
+                sum(status_counts.get(status, 0) for status in ON_TIME) / len(statuses) * 100, 2
+            ) if statuses else 0
+        },
+        'temporal_patterns': {
+            'hourly_distribution': hour_counts.to_dict(),
+            'peak_hours': hour_counts.nlargest(3).index.tolist(),
+            'busiest_hour': hour_counts.idxmax(),
+            'quietest_hour': hour_counts.idxmin()
+        }
+    }
+
+
+def typed_items(value):
+    """A value with every dict turned into its ordered (key type, key, value) items, for exact comparison"""
+    if isinstance(value, dict):
+        return [(type(key), key, typed_items(item)) for key, item in value.items()]
+    if isinstance(value, list):
+        return [typed_items(item) for item in value]
+    return (type(value), value)
+
+
+def datasets():
+    # Small datasets have many tied counts, whose order must match too
+    for seed, size in ((1, 12), (2, 40), (3, 300), (4, 2000)):
+        yield MockFlightGenerator(seed).generate(size)
+    random.seed(5)
+    yield AdvancedAirlineScraper()._generate_enhanced_mock_data(limit=60)
+
+
+@pytest.mark.parametrize('data', list(datasets()))
+def test_process_data_matches_the_reference(data):
+    from app import scraper
+
+    insights = scraper.process_data(ingest(data))
+
+    expected = reference_process_data(data['data'])
+    assert typed_items({key: insights[key] for key in expected}) == typed_items(expected)
+
+
+@pytest.mark.parametrize('data', list(datasets()))
+def test_market_insights_match_the_reference(data):
+    insights = AdvancedAirlineScraper().get_market_insights(ingest(data))
+
+    expected = reference_market_insights(data['data'])
+    for section, values in expected.items():
+        actual = {key: insights[section][key] for key in values}
+        assert typed_items(actual) == typed_items(values), section
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+import data_scraper
+from http_client import UpstreamClient, create_session
+
+
+@pytest.fixture
+def scraper(monkeypatch, upstream):
+    """Scraper whose upstream is a local fake, without retry backoff"""
+    def start(**kwargs):
+        server = upstream(**kwargs)
+        client = UpstreamClient(base_url=server.base_url, session=create_session(retries=0))
+        monkeypatch.setattr(data_scraper, 'shared_upstream_client', lambda: client)
+        return server, data_scraper.AdvancedAirlineScraper()
+
+    return start
+
+
+def test_mock_fallback_is_neither_cached_nor_published(scraper):
+    server, advanced = scraper(error_rate=1.0)
+
+    data = advanced.get_flight_data_with_scraping(source='aviationstack', route_from='ORD', limit=20)
+
+    assert server.requests == 1
+    assert len(data['data']) == 20
+    assert len(advanced.cache) == 0
+    _, result_path, _ = advanced.cache.single_flight._paths(('ORD', None, 20))
+    assert not os.path.exists(result_path)
+
+
+def test_fallback_can_be_disabled(scraper):
+    import requests
+
+    _, advanced = scraper(error_rate=1.0)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        advanced.get_flight_data_with_scraping(source='aviationstack', route_from='DFW', fallback_to_mock=False)
+
+
+def test_single_flight_is_created_on_the_first_cached_fetch(scraper):
+    _, advanced = scraper()
+
+    advanced.get_flight_data_with_scraping(source='aviationstack', route_from='ATL', use_cache=False)
+    assert advanced._cache is None
+
+    advanced.get_flight_data_with_scraping(source='aviationstack', route_from='ATL')
+    assert advanced._cache is not None
+
+
+def test_concurrent_identical_fetches_make_one_upstream_call(scraper):
+    from concurrent.futures import ThreadPoolExecutor
+
+    server, advanced = scraper(latency=0.2)
+    # A second scraper stands in for another worker sharing the single-flight directory
+    other = data_scraper.AdvancedAirlineScraper()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(
+            lambda fetcher: fetcher.get_flight_data_with_scraping(source='aviationstack', route_from='LAX', limit=30),
+            [advanced, advanced, other]
+        ))
+
+    assert server.requests == 1
+    assert all(result['data'] == results[0]['data'] for result in results)
+
+
+def test_bulk_mock_fallback_warns_that_it_is_capped(scraper, caplog):
+    _, advanced = scraper(error_rate=1.0)
+
+    data = advanced.get_flight_data_with_scraping(source='aviationstack_bulk', route_from='SEA', limit=5000)
+
+    assert len(data['data']) == data_scraper.ENHANCED_MOCK_MAX_FLIGHTS
+    assert 'capped at 100 of the 5000 flights' in caplog.text
@@ -0,0 +1,25 @@
+from flight_table import ingest
+from mock_generator import MockFlightGenerator
+
+
+def test_ndjson_streams_the_whole_snapshot(serve_snapshot):
+    client = serve_snapshot(ingest(MockFlightGenerator(7).generate(5000)))
+
+    lines = client.get('/api/data?format=ndjson').get_data().splitlines()
+
+    assert len(lines) == 5000
+
+
+def test_ndjson_limit_is_not_capped_at_the_upstream_page_size(serve_snapshot):
+    client = serve_snapshot(ingest(MockFlightGenerator(7).generate(5000)))
+
+    assert len(client.get('/api/data?format=ndjson&limit=1200').get_data().splitlines()) == 1200
+    assert len(client.get('/api/data?format=ndjson&limit=100000').get_data().splitlines()) == 5000
+
+
+def test_json_pages_keep_the_upstream_limit(serve_snapshot):
+    client = serve_snapshot(ingest(MockFlightGenerator(7).generate(5000)))
+
+    body = client.get('/api/data?limit=100000').get_json()
+
+    assert body['page']['total'] == 100
@@ -0,0 +1,32 @@
+import copy
+
+from flight_table import build_flight_table, ingest
+from mock_generator import MockFlightGenerator
+
+
+def test_version_is_stable_for_equal_content():
+    data = MockFlightGenerator(3).generate(200)
+
+    assert ingest(copy.deepcopy(data)).version == ingest(copy.deepcopy(data)).version
+
+
+def test_version_changes_with_fields_outside_the_table():
+    data = MockFlightGenerator(3).generate(200)
+    changed = copy.deepcopy(data)
+    changed['data'][150]['departure']['gate'] = 'Z99'
+
+    assert ingest(changed).version != ingest(data).version
+
+
+def test_missing_nested_fields_become_missing_values():
+    flights = MockFlightGenerator(3).generate(3)['data']
+    flights[0]['departure'] = None
+    flights[1].pop('flight_date')
+    flights[2]['flight'] = None
+
+    table = build_flight_table(flights)
+
+    assert table['dep_iata'].isna().tolist() == [True, False, False]
+    assert table['route'].isna().tolist() == [True, False, False]
+    assert table['flight_date'].isna().tolist() == [False, True, False]
+    assert table['flight_iata'].isna().tolist() == [False, False, True]
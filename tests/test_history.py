@@ -0,0 +1,31 @@
+from flight_table import ingest
+from history import FlightHistory
+from mock_generator import MockFlightGenerator
+
+
+def test_repeated_range_queries_reuse_the_computed_insights(serve_snapshot, monkeypatch, tmp_path):
+    import app as dashboard
+
+    data = MockFlightGenerator(11).generate(300)
+    history = FlightHistory(str(tmp_path))
+    history.append(data['data'])
+    queries = []
+    query = history.query
+
+    def counted_query(*args):
+        queries.append(args)
+        return query(*args)
+
+    monkeypatch.setattr(history, 'query', counted_query)
+    monkeypatch.setattr(dashboard, 'history', history)
+    dashboard.history_cache.clear()
+    client = serve_snapshot(ingest(data))
+
+    days = sorted({flight['flight_date'] for flight in data['data']})
+    url = f'/api/history?start={days[0]}&end={days[-1]}'
+    first = client.get(url).get_json()
+    second = client.get(url).get_json()
+
+    assert first == second
+    assert sum(first['daily_flights'].values()) == 300
+    assert len(queries) == 1
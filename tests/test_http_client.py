@@ -0,0 +1,88 @@
+import pytest
+import requests
+
+from http_client import UpstreamClient, create_session
+
+
+def make_client(server, retries=2, timeout=(1, 5)):
+    return UpstreamClient(base_url=server.base_url, timeout=timeout,
+                          session=create_session(retries=retries, backoff=0, jitter=0))
+
+
+def test_a_5xx_is_retried_until_success(upstream):
+    server = upstream()
+    server.fail_next = 1
+
+    body = make_client(server).get_json('flights', {'limit': 5})
+
+    assert len(body['data']) == 5
+    assert server.requests == 2
+
+
+def test_5xx_past_the_retries_raises(upstream):
+    server = upstream()
+    server.fail_next = 5
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        make_client(server, retries=1).get_json('flights')
+    assert server.requests == 2
+
+
+def test_timeouts_past_the_retries_raise(upstream):
+    server = upstream(latency=0.5)
+
+    with pytest.raises(requests.exceptions.RequestException):
+        make_client(server, retries=1, timeout=(1, 0.05)).get_json('flights')
+    assert server.requests == 2
+
+
+def test_calls_reuse_one_connection(upstream):
+    server = upstream()
+    client = make_client(server)
+
+    for offset in (0, 100, 200):
+        client.get_json('flights', {'offset': offset})
+
+    assert server.requests == 3
+    assert server.connections == 1
+
+
+def flight_ids(flights):
+    return [(flight['flight']['iata'], flight['flight_date']) for flight in flights]
+
+
+def test_pages_are_merged_in_offset_order(upstream):
+    server = upstream(flights=950, latency=0.02, jitter=0.02)
+
+    merged = make_client(server).get_all_pages('flights', page_size=100, workers=4)
+
+    assert flight_ids(merged['data']) == flight_ids(server.flights)
+    assert merged['pagination'] == {'limit': 950, 'offset': 0, 'count': 950, 'total': 950}
+    assert server.requests == 10
+
+
+def test_max_records_truncates_mid_page(upstream):
+    server = upstream(flights=950)
+
+    merged = make_client(server).get_all_pages('flights', page_size=100, max_records=250)
+
+    assert flight_ids(merged['data']) == flight_ids(server.flights[:250])
+    assert merged['pagination']['total'] == 950
+    assert server.requests == 3
+
+
+def test_a_short_last_page_is_kept_whole(upstream):
+    server = upstream(flights=205)
+
+    merged = make_client(server).get_all_pages('flights', page_size=100)
+
+    assert flight_ids(merged['data']) == flight_ids(server.flights)
+    assert server.requests == 3
+
+
+def test_one_failing_page_fails_the_whole_fetch(upstream, monkeypatch):
+    server = upstream(flights=500)
+    monkeypatch.setattr(server, 'should_fail', lambda params: params.get('offset') == '300')
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        make_client(server, retries=0).get_all_pages('flights', page_size=100)
@@ -0,0 +1,26 @@
+import pytest
+
+from data_scraper import AdvancedAirlineScraper
+from flight_table import ingest
+from mock_generator import MockFlightGenerator
+from serialization import SERIALIZERS
+
+
+@pytest.mark.parametrize('name', sorted(SERIALIZERS))
+def test_sorted_int_keys_are_in_numeric_order(name):
+    dumps, _ = SERIALIZERS[name]
+
+    assert dumps({23: 0, 9: 1}, sort_keys=True) == b'{"9":1,"23":0}'
+    assert dumps({'b': {10: 1, 7: 2}, 'a': [{'y': 1, 'x': 2}]}, sort_keys=True) == \
+        b'{"a":[{"x":2,"y":1}],"b":{"7":2,"10":1}}'
+
+
+@pytest.mark.skipif('orjson' not in SERIALIZERS, reason='orjson is not installed')
+def test_orjson_matches_the_stdlib_encoder_on_sorted_insights():
+    from app import scraper
+
+    data = ingest(MockFlightGenerator(3).generate(500))
+    payloads = [scraper.process_data(data), AdvancedAirlineScraper().get_market_insights(data)]
+
+    for payload in payloads:
+        assert SERIALIZERS['orjson'][0](payload, sort_keys=True) == SERIALIZERS['stdlib'][0](payload, sort_keys=True)